@@ -4,6 +4,11 @@ Revision ID: 001
 Revises:
 Create Date: 2024-10-23 16:30:00.000000
 
+The ``id`` primary key has no server default: ids are generated application-side
+as time-ordered UUIDv7 values (``app.core.ids.uuid7``) so inserts append to the
+right edge of ``auth_vault_pkey`` instead of splitting random B-tree pages.
+The column type stays ``UUID``, so existing v4 ids remain valid.
+
 """
 
 from typing import Sequence, Union
@@ -0,0 +1,46 @@
+"""require_encrypted_token_and_iv
+
+Revision ID: 002
+Revises: 001
+Create Date: 2026-10-15 10:00:00.000000
+
+Every vault entry is written with its ciphertext and IV, so both columns become
+NOT NULL. A plain ``SET NOT NULL`` scans the table under an ACCESS EXCLUSIVE
+lock; instead a ``CHECK ... NOT VALID`` constraint is added and validated
+without blocking writes, which lets PostgreSQL (12+) set NOT NULL without
+scanning again. The upgrade fails if any entry is missing either column.
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "002"
+down_revision: Union[str, None] = "001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_COLUMNS = ("encrypted_token", "iv")
+
+
+def upgrade() -> None:
+    """Make encrypted_token and iv NOT NULL."""
+    # Each statement commits on its own so that only the brief ADD CONSTRAINT
+    # and SET NOT NULL steps take the ACCESS EXCLUSIVE lock.
+    with op.get_context().autocommit_block():
+        for column in _COLUMNS:
+            op.execute(
+                f"ALTER TABLE auth_vault ADD CONSTRAINT auth_vault_{column}_not_null "
+                f"CHECK ({column} IS NOT NULL) NOT VALID"
+            )
+            op.execute(f"ALTER TABLE auth_vault VALIDATE CONSTRAINT auth_vault_{column}_not_null")
+            op.alter_column("auth_vault", column, nullable=False)
+            op.drop_constraint(f"auth_vault_{column}_not_null", "auth_vault", type_="check")
+
+
+def downgrade() -> None:
+    """Allow NULL encrypted_token and iv again."""
+    for column in _COLUMNS:
+        op.alter_column("auth_vault", column, nullable=True)
@@ -0,0 +1,61 @@
+"""unique_refresh_token_per_user
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-15 11:00:00.000000
+
+Adds the partial unique index that ``TokenVaultRepository.upsert_refresh_token``
+uses as its ``ON CONFLICT (user_id) WHERE token_type = 'refresh'`` arbiter.
+The previous select-then-insert upsert could leave several refresh tokens for
+one user, so all but the newest of them are deleted first. Apply this revision
+before deploying the ON CONFLICT upsert, which fails without the index.
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "003"
+down_revision: Union[str, None] = "002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Deduplicate refresh tokens and add a unique index on them per user."""
+    # Keep each user's newest refresh token, breaking created_at ties by id
+    op.execute(
+        """
+        DELETE FROM auth_vault AS older
+        USING auth_vault AS newer
+        WHERE older.token_type = 'refresh'
+          AND newer.token_type = 'refresh'
+          AND older.user_id = newer.user_id
+          AND (older.created_at, older.id) < (newer.created_at, newer.id)
+        """
+    )
+
+    # CONCURRENTLY cannot run inside a transaction, hence the autocommit block
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "auth_vault_user_refresh_token_uidx",
+            "auth_vault",
+            ["user_id"],
+            unique=True,
+            postgresql_where=sa.text("token_type = 'refresh'"),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Drop the unique refresh token index."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "auth_vault_user_refresh_token_uidx",
+            table_name="auth_vault",
+            postgresql_concurrently=True,
+        )
@@ -0,0 +1,56 @@
+"""user_token_type_created_at_index
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-15 12:00:00.000000
+
+Replaces ``auth_vault_user_id_token_type_idx`` with an index that also covers
+``created_at``, so "latest token of a type for a user" lookups walk the index
+backwards instead of sorting the matching rows. The new index is built before
+the old one is dropped, both CONCURRENTLY, so lookups stay indexed and writes
+are never blocked.
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "004"
+down_revision: Union[str, None] = "003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add (user_id, token_type, created_at) and drop the (user_id, token_type) index."""
+    # CONCURRENTLY cannot run inside a transaction, hence the autocommit block
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "auth_vault_user_id_token_type_created_at_idx",
+            "auth_vault",
+            ["user_id", "token_type", "created_at"],
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "auth_vault_user_id_token_type_idx",
+            table_name="auth_vault",
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Restore the (user_id, token_type) index."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "auth_vault_user_id_token_type_idx",
+            "auth_vault",
+            ["user_id", "token_type"],
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "auth_vault_user_id_token_type_created_at_idx",
+            table_name="auth_vault",
+            postgresql_concurrently=True,
+        )
@@ -0,0 +1,51 @@
+"""hash_index_on_token_hash
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-15 12:10:00.000000
+
+token_hash is only ever compared for equality, so its B-tree index is
+replaced with a hash index, which stores a 4-byte hash code per row instead
+of the 64-character hex digest. The hash index is built CONCURRENTLY under a
+temporary name, the B-tree index is dropped CONCURRENTLY, and the new index
+then takes over the original name.
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "005"
+down_revision: Union[str, None] = "004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_INDEX = "auth_vault_token_hash_idx"
+_NEW_INDEX = "auth_vault_token_hash_idx_new"
+
+
+def _swap_index(using: str) -> None:
+    """Rebuild the token_hash index with ``using`` without blocking writes."""
+    # CONCURRENTLY cannot run inside a transaction, hence the autocommit block
+    with op.get_context().autocommit_block():
+        op.create_index(
+            _NEW_INDEX,
+            "auth_vault",
+            ["token_hash"],
+            postgresql_using=using,
+            postgresql_concurrently=True,
+        )
+        op.drop_index(_INDEX, table_name="auth_vault", postgresql_concurrently=True)
+        op.execute(f"ALTER INDEX {_NEW_INDEX} RENAME TO {_INDEX}")
+
+
+def upgrade() -> None:
+    """Replace the token_hash B-tree index with a hash index."""
+    _swap_index("hash")
+
+
+def downgrade() -> None:
+    """Restore the token_hash B-tree index."""
+    _swap_index("btree")
@@ -1,19 +1,24 @@
 """Health check endpoints."""
 
+from functools import cache
+
 from fastapi import APIRouter, status
 from pydantic import BaseModel
-from sqlalchemy import text
 from starlette.responses import Response
 
 from app.config import get_settings
+from app.core.cache import TTLCache
 from app.core.logging import get_logger
-from app.dependencies import SessionDep
+from app.dependencies import ReadSessionDep
 from app.models.api import SuccessResponse
 
 logger = get_logger(__name__)
 
 router = APIRouter(tags=["health"])
 
+# Last database probe result, reused for bursts of readiness probes
+_readiness_cache: TTLCache[bool] = TTLCache(maxsize=1, ttl=2.0)
+
 
 class HealthStatus(BaseModel):
     """Health status response model."""
@@ -32,74 +37,92 @@ class ReadinessStatus(BaseModel):
     database: str
 
 
-@router.get("/health", status_code=status.HTTP_200_OK)
-async def health_check() -> SuccessResponse[HealthStatus]:
+@cache
+def _health_body() -> bytes:
+    """Serialize the health response once; it is constant for the process lifetime."""
+    settings = get_settings()
+    return (
+        SuccessResponse(
+            data=HealthStatus(
+                status="healthy",
+                version=settings.version,
+                service=settings.app_name,
+            )
+        )
+        .model_dump_json()
+        .encode()
+    )
+
+
+@router.get(
+    "/health",
+    response_model=SuccessResponse[HealthStatus],
+    status_code=status.HTTP_200_OK,
+)
+async def health_check() -> Response:
     """Basic health check endpoint.
 
     Requirements:
         - 15.1: Return 200 OK response with status "healthy"
         - 15.5: Include version information
     """
-    settings = get_settings()
     logger.debug("health_check")
 
-    return SuccessResponse(
-        data=HealthStatus(
-            status="healthy",
-            version=settings.version,
-            service=settings.app_name,
+    return Response(content=_health_body(), media_type="application/json")
+
+
+@cache
+def _readiness_body(ready: bool) -> bytes:
+    """Serialize the readiness response once per state."""
+    settings = get_settings()
+    return (
+        SuccessResponse(
+            data=ReadinessStatus(
+                status="ready" if ready else "not_ready",
+                version=settings.version,
+                service=settings.app_name,
+                database="connected" if ready else "disconnected",
+            )
         )
+        .model_dump_json()
+        .encode()
     )
 
 
-@router.get("/health/ready")
-async def readiness_check(db: SessionDep) -> Response:
+@router.get(
+    "/health/ready",
+    response_model=SuccessResponse[ReadinessStatus],
+    status_code=status.HTTP_200_OK,
+    responses={status.HTTP_503_SERVICE_UNAVAILABLE: {"model": SuccessResponse[ReadinessStatus]}},
+)
+async def readiness_check(db: ReadSessionDep) -> Response:
     """Readiness check endpoint with database connectivity verification.
 
+    The database probe result is cached for a couple of seconds so bursts of
+    orchestrator probes do not each take a pooled connection.
+
     Requirements:
         - 15.2: Check database connectivity
         - 15.3: Return 200 if ready, 503 if not ready
         - 15.4: Handle database connection errors gracefully
         - 15.5: Include version information
     """
-    settings = get_settings()
     logger.debug("readiness_check")
 
-    try:
-        result = await db.execute(text("SELECT 1"))
-        result.scalar_one()
-
-        logger.info("readiness_check_passed")
-
-        response_data = SuccessResponse(
-            data=ReadinessStatus(
-                status="ready",
-                version=settings.version,
-                service=settings.app_name,
-                database="connected",
-            )
-        )
-
-        return Response(
-            content=response_data.model_dump_json(),
-            status_code=status.HTTP_200_OK,
-            media_type="application/json",
-        )
-
-    except Exception as e:
-        logger.error("readiness_check_failed", error=str(e))
-
-        response_data = SuccessResponse(
-            data=ReadinessStatus(
-                status="not_ready",
-                version=settings.version,
-                service=settings.app_name,
-                database="disconnected",
-            )
-        )
-
-        return Response(
-            content=response_data.model_dump_json(),
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            media_type="application/json",
-        )
+    ready = _readiness_cache.get("database")
+    if ready is None:
+        try:
+            connection = await db.connection()
+            await connection.exec_driver_sql("SELECT 1")
+            ready = True
+            logger.info("readiness_check_passed")
+        except Exception as e:
+            ready = False
+            logger.error("readiness_check_failed", error=str(e))
+        _readiness_cache.set("database", ready)
+
+    return Response(
+        content=_readiness_body(ready),
+        status_code=status.HTTP_200_OK if ready else status.HTTP_503_SERVICE_UNAVAILABLE,
+        media_type="application/json",
+    )
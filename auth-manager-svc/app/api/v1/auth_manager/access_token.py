@@ -1,11 +1,12 @@
 """Access token endpoint."""
 
+from uuid import UUID
+
 from fastapi import APIRouter, Query, status
-from pydantic import UUID4
 
 from app.core.logging import get_logger
 from app.core.security import BearerToken
-from app.dependencies import KeycloakDep, TokenVaultServiceDep
+from app.dependencies import KeycloakDep, ReadTokenVaultServiceDep
 from app.models.api import SuccessResponse
 from app.models.responses import AccessTokenResponse
 
@@ -75,8 +76,8 @@ router = APIRouter(tags=["access-token"])
 async def get_access_token(
     token: BearerToken,
     keycloak: KeycloakDep,
-    token_vault: TokenVaultServiceDep,
-    id: UUID4 = Query(..., description="Persistent token ID (UUID)"),
+    token_vault: ReadTokenVaultServiceDep,
+    id: UUID = Query(..., description="Persistent token ID (UUID)"),
 ) -> SuccessResponse[AccessTokenResponse]:
     """Get a fresh access token using a stored refresh/offline token.
 
@@ -1,12 +1,16 @@
 """Offline token consent and callback endpoints."""
 
 from typing import Optional
-from urllib.parse import urlencode
-from uuid import UUID
 
 from fastapi import APIRouter, Query, status
 
-from app.core.exceptions import InvalidStateTokenError, KeycloakError
+from app.core.exceptions import (
+    InvalidStateTokenError,
+    KeycloakError,
+    TokenNotActiveError,
+    ValidationError,
+)
+from app.core.guards import ensure_not_none
 from app.core.logging import get_logger
 from app.core.security import BearerToken
 from app.db.models import TokenType
@@ -97,56 +101,51 @@ async def request_offline_token_consent(
     Raises:
         UnauthorizedError: If bearer token is missing or invalid
     """
-    from app.core.guards import guard_condition, guard_not_none
-
     logger.info("request_offline_token_consent")
 
     # Requirement 9.2: Extract user_id and session_state_id from token
     token_info = await keycloak.introspect_token(token)
 
-    # Validate token is active
-    with guard_condition(token_info.active, "Access token is not active", "token_not_active"):
-        # Validate required claims are present
-        with guard_not_none(token_info.sub, "Token missing required claim: sub") as user_id:
-            with guard_not_none(
-                token_info.session_state, "Token missing required claim: session_state"
-            ) as session_state_id:
-                logger.info(
-                    "token_introspected",
-                    user_id=user_id,
-                    session_state_id=session_state_id,
-                )
-
-                # Requirement 9.3: Generate state token with user_id and session_state_id
-                state_token = state_token_service.generate_state_token(
-                    user_id=user_id,
-                    session_state_id=session_state_id,
-                )
-
-                logger.info("state_token_generated", session_state_id=session_state_id)
-
-                # Requirement 9.4: Construct Keycloak authorization URL with offline_access scope
-                auth_params = {
-                    "client_id": keycloak.settings.client_id,
-                    "redirect_uri": keycloak.settings.redirect_uri,
-                    "response_type": "code",
-                    "scope": "openid offline_access",
-                    "state": state_token,
-                }
+    # Validate token is active and carries the required claims
+    if not token_info.active:
+        raise TokenNotActiveError("Access token is not active")
+    user_id = token_info.sub
+    if user_id is None:
+        raise ValidationError("Token missing required claim: sub", {"field": "sub"})
+    session_state_id = token_info.session_state
+    if session_state_id is None:
+        raise ValidationError(
+            "Token missing required claim: session_state", {"field": "session_state"}
+        )
+
+    logger.info(
+        "token_introspected",
+        user_id=user_id,
+        session_state_id=session_state_id,
+    )
 
-                consent_url = f"{keycloak.settings.authorization_endpoint}?{urlencode(auth_params)}"
+    # Requirement 9.3: Generate state token with user_id and session_state_id
+    state_token = state_token_service.generate_state_token(
+        user_id=user_id,
+        session_state_id=session_state_id,
+    )
 
-                logger.info("consent_url_generated", consent_url=consent_url)
+    logger.info("state_token_generated", session_state_id=session_state_id)
 
-                # Requirement 9.5: Return consent URL, session_state_id, state token, and message
-                return SuccessResponse(
-                    data=OfflineConsentResponse(
-                        consent_url=consent_url,
-                        session_state_id=session_state_id,
-                        state_token=state_token,
-                        message="Please visit the consent URL to authorize offline access",
-                    )
-                )
+    # Requirement 9.4: Construct Keycloak authorization URL with offline_access scope
+    consent_url = keycloak.build_consent_url(state_token)
+
+    logger.info("consent_url_generated", consent_url=consent_url)
+
+    # Requirement 9.5: Return consent URL, session_state_id, state token, and message
+    return SuccessResponse(
+        data=OfflineConsentResponse(
+            consent_url=consent_url,
+            session_state_id=session_state_id,
+            state_token=state_token,
+            message="Please visit the consent URL to authorize offline access",
+        )
+    )
 
 
 @router.get(
@@ -252,8 +251,6 @@ async def offline_token_callback(
         InvalidStateTokenError: If state token is invalid or expired (400)
         KeycloakError: If Keycloak returns an error or code exchange fails (400/500)
     """
-    from app.core.guards import guard_not_none
-
     logger.info("offline_token_callback", has_code=True, has_state=True)
 
     # Requirement 10.7: Handle Keycloak error parameter
@@ -267,7 +264,7 @@ async def offline_token_callback(
         state_payload = state_token_service.parse_state_token(state)
         logger.info(
             "state_token_parsed",
-            user_id=state_payload.user_id,
+            user_id=str(state_payload.user_id),
             session_state_id=state_payload.session_state_id,
         )
     except InvalidStateTokenError as e:
@@ -290,35 +287,36 @@ async def offline_token_callback(
         raise
 
     # Verify we received a refresh token (offline token)
-    with guard_not_none(
+    offline_token = ensure_not_none(
         token_response.refresh_token,
         "No refresh token received from Keycloak",
         "keycloak_error",
-    ) as offline_token:
-        # Requirement 10.4: Encrypt and store offline token in vault with type "offline"
-        user_id = UUID(state_payload.user_id)
-        stored_entry = await token_vault_service.store_token(
-            user_id=user_id,
-            token=offline_token,
-            token_type=TokenType.OFFLINE,
-            session_state_id=state_payload.session_state_id,
-            metadata={
-                "scope": token_response.scope,
-                "token_type": token_response.token_type,
-            },
-        )
-
-        logger.info(
-            "offline_token_stored",
-            persistent_token_id=str(stored_entry.id),
-            user_id=str(user_id),
+    )
+
+    # Requirement 10.4: Encrypt and store offline token in vault with type "offline"
+    user_id = state_payload.user_id
+    stored_entry = await token_vault_service.store_token(
+        user_id=user_id,
+        token=offline_token,
+        token_type=TokenType.OFFLINE,
+        session_state_id=state_payload.session_state_id,
+        metadata={
+            "scope": token_response.scope,
+            "token_type": token_response.token_type,
+        },
+    )
+
+    logger.info(
+        "offline_token_stored",
+        persistent_token_id=str(stored_entry.id),
+        user_id=str(user_id),
+        session_state_id=state_payload.session_state_id,
+    )
+
+    # Requirement 10.5: Return persistent_token_id and session_state_id
+    return SuccessResponse(
+        data=OfflineTokenResponse(
+            persistent_token_id=stored_entry.id,
             session_state_id=state_payload.session_state_id,
         )
-
-        # Requirement 10.5: Return persistent_token_id and session_state_id
-        return SuccessResponse(
-            data=OfflineTokenResponse(
-                persistent_token_id=stored_entry.id,
-                session_state_id=state_payload.session_state_id,
-            )
-        )
+    )
@@ -1,14 +1,19 @@
 """Refresh token ID endpoint."""
 
+from uuid import UUID
+
 from fastapi import APIRouter, status
 
-from app.core.exceptions import InvalidRequestError, TokenNotFoundError
+from app.core.exceptions import InvalidRequestError
+from app.core.guards import ensure_not_none
 from app.core.logging import get_logger
 from app.core.security import BearerToken
 from app.db.models import TokenType
 from app.dependencies import KeycloakDep, TokenVaultServiceDep
 from app.models.api import SuccessResponse
 from app.models.responses import RefreshTokenIdResponse
+from app.services.keycloak import KeycloakService
+from app.services.token_vault import TokenVaultService
 
 logger = get_logger(__name__)
 
@@ -58,18 +63,6 @@ router = APIRouter(tags=["refresh-token-id"])
                 }
             },
         },
-        404: {
-            "description": "No active refresh token found",
-            "content": {
-                "application/json": {
-                    "example": {
-                        "error": "No active refresh token was found",
-                        "code": "token_not_found",
-                        "reason": None,
-                    }
-                }
-            },
-        },
         500: {
             "description": "Keycloak error or internal server error",
             "content": {
@@ -106,86 +99,102 @@ async def make_new_refresh_token_id(
     Raises:
         UnauthorizedError: If bearer token is missing or invalid
         InvalidRequestError: If no session found (400)
-        TokenNotFoundError: If no active refresh token found (404)
         KeycloakError: If refresh token generation fails
     """
-    from uuid import UUID
-
-    from app.core.guards import guard_not_none
-
     logger.info("make_new_refresh_token_id")
 
     # Validate Bearer token and extract user information
     token_info = await keycloak.introspect_token(token)
 
     # Validate required claims are present
-    with guard_not_none(token_info.sub, "Token missing required claim: sub") as user_id:
-        session_id = token_info.session_state
-
-        logger.info(
-            "token_introspected",
-            user_id=user_id,
-            session_id=session_id,
-        )
-
-        # Get user's existing refresh token by user_id
-        user_uuid = UUID(user_id)
-        refresh_token_data = await token_vault.get_by_user_id(
-            user_id=user_uuid,
-            token_type=TokenType.REFRESH,
+    user_id = ensure_not_none(token_info.sub, "Token missing required claim: sub")
+    session_id = token_info.session_state
+
+    logger.info(
+        "token_introspected",
+        user_id=user_id,
+        session_id=session_id,
+    )
+
+    new_token_id = await _rotate_refresh_token(
+        user_id, token_info.sub_uuid, session_id, keycloak, token_vault
+    )
+
+    # Return new persistent_token_id
+    return SuccessResponse(
+        data=RefreshTokenIdResponse(
+            persistent_token_id=new_token_id,
         )
+    )
 
-        # Handle no refresh token found
-        if not refresh_token_data:
-            logger.warning("no_refresh_token_found", user_id=user_id)
-            raise InvalidRequestError("No session nor was found")
-
-        entry, decrypted_token = refresh_token_data
-
-        # Validate token has encrypted data
-        if not entry.encrypted_token or not entry.iv:
-            logger.error("token_missing_data", token_id=str(entry.id))
-            raise TokenNotFoundError("No active refresh token was found")
 
-        logger.info(
-            "refresh_token_retrieved",
-            persistent_token_id=str(entry.id),
-            user_id=user_id,
-        )
-
-        # Use existing refresh token to get new tokens from Keycloak
-        new_token_response = await keycloak.refresh_access_token(decrypted_token)
+async def _rotate_refresh_token(
+    user_id: str,
+    user_uuid: UUID,
+    session_id: str | None,
+    keycloak: KeycloakService,
+    token_vault: TokenVaultService,
+) -> str:
+    """Exchange the user's stored refresh token for a new one and store it.
 
-        logger.info(
-            "access_token_refreshed",
-            session_state=new_token_response.session_state,
-            has_refresh_token=new_token_response.refresh_token is not None,
-        )
+    Keycloak invalidates the previous refresh token on every rotation, so
+    rotations for the same user are serialized with a database lock held until
+    the request's transaction commits. A request queued behind another one then
+    reads the refresh token that rotation stored, on any replica.
 
-        # Verify we received a new refresh token
-        with guard_not_none(
-            new_token_response.refresh_token,
-            "No refresh token was generated",
-            "no_refresh_token",
-        ) as new_refresh_token:
-            # Upsert the new refresh token (ensures only one per user)
-            new_token_id = await token_vault.upsert_refresh_token(
-                user_id=user_uuid,
-                token=new_refresh_token,
-                session_state_id=new_token_response.session_state,
-                metadata={"session_id": session_id},
-            )
-
-            logger.info(
-                "refresh_token_upserted",
-                persistent_token_id=new_token_id,
-                user_id=user_id,
-                session_state_id=new_token_response.session_state,
-            )
-
-            # Return new persistent_token_id
-            return SuccessResponse(
-                data=RefreshTokenIdResponse(
-                    persistent_token_id=new_token_id,
-                )
-            )
+    Returns:
+        Persistent token ID of the user's refresh token entry
+    """
+    await token_vault.lock_user_refresh_token(user_uuid)
+
+    # Get user's existing refresh token by user_id
+    refresh_token_data = await token_vault.get_by_user_id(
+        user_id=user_uuid,
+        token_type=TokenType.REFRESH,
+    )
+
+    # Handle no refresh token found
+    if not refresh_token_data:
+        logger.warning("no_refresh_token_found", user_id=user_id)
+        raise InvalidRequestError("No session nor was found")
+
+    entry, decrypted_token = refresh_token_data
+
+    logger.info(
+        "refresh_token_retrieved",
+        persistent_token_id=str(entry.id),
+        user_id=user_id,
+    )
+
+    # Use existing refresh token to get new tokens from Keycloak
+    new_token_response = await keycloak.refresh_access_token(decrypted_token)
+
+    logger.info(
+        "access_token_refreshed",
+        session_state=new_token_response.session_state,
+        has_refresh_token=new_token_response.refresh_token is not None,
+    )
+
+    # Verify we received a new refresh token
+    new_refresh_token = ensure_not_none(
+        new_token_response.refresh_token,
+        "No refresh token was generated",
+        "no_refresh_token",
+    )
+
+    # Upsert the new refresh token (ensures only one per user)
+    new_token_id = await token_vault.upsert_refresh_token(
+        user_id=user_uuid,
+        token=new_refresh_token,
+        session_state_id=new_token_response.session_state,
+        metadata={"session_id": session_id},
+    )
+
+    logger.info(
+        "refresh_token_upserted",
+        persistent_token_id=new_token_id,
+        user_id=user_id,
+        session_state_id=new_token_response.session_state,
+    )
+
+    return new_token_id
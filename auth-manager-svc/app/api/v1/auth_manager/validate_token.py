@@ -1,18 +1,26 @@
-"""Token validation endpoint."""
+"""Token validation endpoints."""
+
+import asyncio
+from typing import List
 
 from fastapi import APIRouter, status
+from starlette.responses import Response
 
-from app.core.guards import guard_condition
+from app.core.guards import ensure_condition
 from app.core.logging import get_logger
 from app.core.security import BearerToken
 from app.dependencies import KeycloakDep
 from app.models.api import SuccessResponse
+from app.models.requests import ValidateTokensRequest
 from app.models.responses import ValidationResponse
 
 logger = get_logger(__name__)
 
 router = APIRouter(tags=["token-validation"])
 
+# The success body never varies, so serialize it once
+_VALID_BODY = SuccessResponse(data=ValidationResponse(valid=True)).model_dump_json().encode()
+
 
 @router.get(
     "/validate-token",
@@ -55,7 +63,7 @@ router = APIRouter(tags=["token-validation"])
 async def validate_token(
     token: BearerToken,
     keycloak: KeycloakDep,
-) -> SuccessResponse[ValidationResponse]:
+) -> Response:
     """Validate an access token via Keycloak introspection.
 
     Requirements:
@@ -65,11 +73,92 @@ async def validate_token(
         - 8.4: Return 401 if not active
         - 8.5: Handle missing Authorization header
     """
-    logger.info("validate_token")
-
+    # No entry log: the access log covers the request, and rejections are
+    # logged by the AuthManagerError handler. Success is only logged at DEBUG,
+    # which the filtering logger drops without building an event.
     introspection_result = await keycloak.introspect_token(token)
 
-    with guard_condition(introspection_result.active, "Token is not active", "token_not_active"):
-        logger.info("token_valid")
+    ensure_condition(introspection_result.active, "Token is not active", "token_not_active")
+    logger.debug("token_valid")
+
+    return Response(content=_VALID_BODY, media_type="application/json")
+
+
+@router.post(
+    "/validate-tokens",
+    response_model=SuccessResponse[List[ValidationResponse]],
+    status_code=status.HTTP_200_OK,
+    summary="Validate a batch of access tokens",
+    description=(
+        "Validates up to 200 access tokens in one request. Results are returned "
+        "in the order of the submitted tokens; a token that cannot be introspected "
+        "is reported as invalid. The caller must present an active Bearer token."
+    ),
+    responses={
+        200: {
+            "description": "Validation result for each token",
+            "content": {
+                "application/json": {"example": {"data": [{"valid": True}, {"valid": False}]}}
+            },
+        },
+        401: {
+            "description": "Caller's token is not active, invalid, or missing",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "error": "Token is not active",
+                        "code": "token_not_active",
+                        "reason": None,
+                    }
+                }
+            },
+        },
+        400: {
+            "description": "Empty batch or more than 200 tokens",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "error": "Validation error",
+                        "code": "validation_error",
+                        "reason": "[{'type': 'too_long', 'loc': ('body', 'tokens'), ...}]",
+                    }
+                }
+            },
+        },
+    },
+)
+async def validate_tokens(
+    request: ValidateTokensRequest,
+    token: BearerToken,
+    keycloak: KeycloakDep,
+) -> SuccessResponse[List[ValidationResponse]]:
+    """Validate several access tokens for fan-out callers.
+
+    Every token goes through ``introspect_token``: cached results are reused,
+    and signed access tokens are checked against the realm keys only when
+    ``introspect_required`` is disabled. The remaining tokens reach Keycloak
+    concurrently, since it has no batch introspection. A failed introspection
+    marks only its own token invalid instead of failing the batch.
+    """
+    logger.info("validate_tokens", count=len(request.tokens))
+
+    caller = await keycloak.introspect_token(token)
+    ensure_condition(caller.active, "Token is not active", "token_not_active")
+
+    results = await asyncio.gather(
+        *(keycloak.introspect_token(t) for t in request.tokens), return_exceptions=True
+    )
+
+    failed = 0
+    for result in results:
+        if isinstance(result, BaseException):
+            # Cancellation and other non-Exception errors must propagate
+            if not isinstance(result, Exception):
+                raise result
+            failed += 1
+    if failed:
+        logger.warning("validate_tokens_introspection_failed", failed=failed)
 
-    return SuccessResponse(data=ValidationResponse(valid=True))
+    return SuccessResponse(
+        data=[ValidationResponse(valid=not isinstance(r, Exception) and r.active) for r in results]
+    )
@@ -1,18 +1,20 @@
 """Configuration management using Pydantic Settings."""
 
-from typing import List
+import json
+from functools import cached_property, lru_cache
+from typing import Annotated, Optional
 
 from pydantic import Field, PostgresDsn, field_validator
-from pydantic_settings import BaseSettings, SettingsConfigDict
+from pydantic_settings import BaseSettings, NoDecode, SettingsConfigDict
 
 
 class DatabaseSettings(BaseSettings):
     """Database configuration settings."""
 
     url: PostgresDsn = Field(..., description="PostgreSQL database URL with asyncpg driver")
-    pool_size: int = Field(default=10, ge=1, le=100, description="Database connection pool size")
+    pool_size: int = Field(default=20, ge=1, le=100, description="Database connection pool size")
     max_overflow: int = Field(
-        default=20,
+        default=40,
         ge=0,
         le=100,
         description="Maximum number of connections that can be created beyond pool_size",
@@ -23,9 +25,45 @@ class DatabaseSettings(BaseSettings):
         le=300,
         description="Timeout in seconds for getting a connection from the pool",
     )
+    pool_recycle: int = Field(
+        default=1800,
+        ge=-1,
+        description="Seconds after which pooled connections are replaced (-1 disables)",
+    )
+    pool_pre_ping: bool = Field(
+        default=False,
+        description="Test connections with a ping on checkout; enable on unreliable networks",
+    )
+    null_pool: bool = Field(
+        default=False,
+        description=(
+            "Open a connection per session instead of pooling; use behind PgBouncer "
+            "in transaction pooling mode, which does the pooling itself"
+        ),
+    )
+    jit: bool = Field(
+        default=False,
+        description="Allow PostgreSQL JIT compilation; its startup cost outweighs short queries",
+    )
     echo: bool = Field(default=False, description="Enable SQLAlchemy query logging")
+    prepared_statement_cache_size: int = Field(
+        default=256,
+        ge=0,
+        le=10000,
+        description=(
+            "Prepared statements cached per asyncpg connection; "
+            "set to 0 behind PgBouncer in transaction pooling mode"
+        ),
+    )
 
-    model_config = SettingsConfigDict(env_prefix="DATABASE_", case_sensitive=False)
+    model_config = SettingsConfigDict(
+        env_prefix="DATABASE_",
+        env_file=".env",
+        env_file_encoding="utf-8",
+        case_sensitive=False,
+        extra="ignore",
+        frozen=True,
+    )
 
 
 class KeycloakSettings(BaseSettings):
@@ -44,8 +82,49 @@ class KeycloakSettings(BaseSettings):
     userinfo_endpoint: str = Field(..., description="Keycloak userinfo endpoint URL")
     admin_url: str = Field(..., description="Keycloak admin API base URL")
     redirect_uri: str = Field(..., description="OAuth callback redirect URI")
+    introspection_cache_ttl: int = Field(
+        default=60,
+        ge=0,
+        le=300,
+        description="Maximum time in seconds to cache active token introspection results",
+    )
+    negative_cache_ttl: int = Field(
+        default=30,
+        ge=0,
+        le=300,
+        description="Time in seconds to remember inactive tokens (0 disables)",
+    )
+    jwks_uri: Optional[str] = Field(
+        default=None,
+        description="Realm JWKS URL (default: {issuer}/protocol/openid-connect/certs)",
+    )
+    jwks_cache_ttl: int = Field(
+        default=3600,
+        ge=60,
+        le=86400,
+        description="Time in seconds to cache the realm signing keys",
+    )
+    introspect_required: bool = Field(
+        default=True,
+        description=(
+            "Always introspect tokens remotely; when disabled, signed access tokens "
+            "are verified locally and revocation is only seen once they expire"
+        ),
+    )
+
+    @property
+    def resolved_jwks_uri(self) -> str:
+        """The configured JWKS URL, or the realm's standard certs endpoint."""
+        return self.jwks_uri or f"{self.issuer.rstrip('/')}/protocol/openid-connect/certs"
 
-    model_config = SettingsConfigDict(env_prefix="KEYCLOAK_", case_sensitive=False)
+    model_config = SettingsConfigDict(
+        env_prefix="KEYCLOAK_",
+        env_file=".env",
+        env_file_encoding="utf-8",
+        case_sensitive=False,
+        extra="ignore",
+        frozen=True,
+    )
 
 
 class EncryptionSettings(BaseSettings):
@@ -73,7 +152,19 @@ class EncryptionSettings(BaseSettings):
 
         return v
 
-    model_config = SettingsConfigDict(env_prefix="AUTH_MANAGER_", case_sensitive=False)
+    @cached_property
+    def key_bytes(self) -> bytes:
+        """The encryption key decoded to its 32 raw bytes, parsed once."""
+        return bytes.fromhex(self.token_vault_encryption_key)
+
+    model_config = SettingsConfigDict(
+        env_prefix="AUTH_MANAGER_",
+        env_file=".env",
+        env_file_encoding="utf-8",
+        case_sensitive=False,
+        extra="ignore",
+        frozen=True,
+    )
 
 
 class StateTokenSettings(BaseSettings):
@@ -87,33 +178,55 @@ class StateTokenSettings(BaseSettings):
         description="State token expiry time in seconds (default: 10 minutes)",
     )
 
-    model_config = SettingsConfigDict(env_prefix="STATE_TOKEN_", case_sensitive=False)
+    model_config = SettingsConfigDict(
+        env_prefix="STATE_TOKEN_",
+        env_file=".env",
+        env_file_encoding="utf-8",
+        case_sensitive=False,
+        extra="ignore",
+        frozen=True,
+    )
 
 
 class CORSSettings(BaseSettings):
     """CORS configuration settings."""
 
-    origins: List[str] = Field(
-        default=["http://localhost:3000"], description="Allowed CORS origins"
+    # NoDecode: parse_origins handles the raw env string (comma-separated or JSON).
+    # A frozenset keeps the per-request origin check O(1) in CORSMiddleware.
+    origins: Annotated[frozenset[str], NoDecode] = Field(
+        default=frozenset({"http://localhost:3000"}), description="Allowed CORS origins"
     )
     allow_credentials: bool = Field(default=True, description="Allow credentials in CORS requests")
 
     @field_validator("origins", mode="before")
     @classmethod
     def parse_origins(cls, v):
-        """Parse comma-separated origins string into list."""
+        """Parse a comma-separated (or JSON list) origins string into a set."""
         if isinstance(v, str):
-            return [origin.strip() for origin in v.split(",")]
+            if v.lstrip().startswith("["):
+                return frozenset(json.loads(v))
+            return frozenset(origin.strip() for origin in v.split(",") if origin.strip())
         return v
 
-    model_config = SettingsConfigDict(env_prefix="CORS_", case_sensitive=False)
+    model_config = SettingsConfigDict(
+        env_prefix="CORS_",
+        env_file=".env",
+        env_file_encoding="utf-8",
+        case_sensitive=False,
+        extra="ignore",
+        frozen=True,
+    )
 
 
 class AppSettings(BaseSettings):
     """Main application settings that aggregates all configuration."""
 
     model_config = SettingsConfigDict(
-        env_file=".env", env_file_encoding="utf-8", case_sensitive=False, extra="ignore"
+        env_file=".env",
+        env_file_encoding="utf-8",
+        case_sensitive=False,
+        extra="ignore",
+        frozen=True,
     )
 
     # Application metadata
@@ -125,12 +238,12 @@ class AppSettings(BaseSettings):
     )
     port: int = Field(default=8000, ge=1, le=65535, description="Application port")
 
-    # Nested configuration settings
-    database: DatabaseSettings
-    keycloak: KeycloakSettings
-    encryption: EncryptionSettings
-    state_token: StateTokenSettings
-    cors: CORSSettings
+    # Nested configuration settings, each loaded from its own env prefix
+    database: DatabaseSettings = Field(default_factory=DatabaseSettings)
+    keycloak: KeycloakSettings = Field(default_factory=KeycloakSettings)
+    encryption: EncryptionSettings = Field(default_factory=EncryptionSettings)
+    state_token: StateTokenSettings = Field(default_factory=StateTokenSettings)
+    cors: CORSSettings = Field(default_factory=CORSSettings)
 
     @field_validator("log_level")
     @classmethod
@@ -144,15 +257,13 @@ class AppSettings(BaseSettings):
 
 
 # Global settings instance
-_settings: AppSettings | None = None
-
-
+@lru_cache(maxsize=1)
 def get_settings() -> AppSettings:
     """
     Get the global settings instance.
 
-    This function implements a singleton pattern to ensure settings
-    are loaded only once and reused across the application.
+    Settings are loaded on the first call and the cached instance is
+    returned afterwards, so the application shares a single AppSettings.
 
     Returns:
         AppSettings: The application settings instance
@@ -160,10 +271,7 @@ def get_settings() -> AppSettings:
     Raises:
         ValidationError: If required environment variables are missing or invalid
     """
-    global _settings
-    if _settings is None:
-        _settings = AppSettings()
-    return _settings
+    return AppSettings()
 
 
 def reset_settings() -> None:
@@ -173,5 +281,4 @@ def reset_settings() -> None:
     This is primarily useful for testing purposes to reload settings
     with different environment variables.
     """
-    global _settings
-    _settings = None
+    get_settings.cache_clear()
@@ -0,0 +1,70 @@
+"""In-process caching utilities."""
+
+import time
+from collections import OrderedDict
+from typing import Generic, Hashable, Optional, TypeVar
+
+V = TypeVar("V")
+
+
+class TTLCache(Generic[V]):
+    """Bounded LRU cache whose entries expire after a time-to-live.
+
+    Entries are evicted least-recently-used first once ``maxsize`` is reached.
+    The cache is meant to be used from a single event loop, so no locking is done.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0):
+        """Initialize the cache.
+
+        Args:
+            maxsize: Maximum number of entries kept in the cache
+            ttl: Default time-to-live in seconds for new entries
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[Hashable, tuple[float, V]] = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[V]:
+        """Return the cached value for ``key``, or None if missing or expired."""
+        item = self._data.get(key)
+        if item is None:
+            return None
+
+        expires_at, value = item
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            return None
+
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: V, ttl: Optional[float] = None) -> None:
+        """Store ``value`` under ``key``.
+
+        Args:
+            key: Cache key
+            value: Value to cache
+            ttl: Optional time-to-live in seconds overriding the default.
+                Non-positive values skip caching.
+        """
+        ttl = self.ttl if ttl is None else ttl
+        if ttl <= 0:
+            return
+
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: Hashable) -> Optional[V]:
+        """Remove ``key`` from the cache and return its value if present."""
+        item = self._data.pop(key, None)
+        return item[1] if item else None
+
+    def clear(self) -> None:
+        """Remove all entries from the cache."""
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
@@ -1,13 +1,21 @@
 """Custom exception classes."""
 
+from types import MappingProxyType
+from typing import Any, Mapping, Optional
+
+# Shared read-only default so raising without details allocates nothing
+_NO_DETAILS: Mapping[str, Any] = MappingProxyType({})
+
 
 class AuthManagerError(Exception):
     """Base exception for Auth Manager."""
 
-    def __init__(self, message: str, code: str = "error", details: dict = None):
+    def __init__(
+        self, message: str, code: str = "error", details: Optional[Mapping[str, Any]] = None
+    ):
         self.message = message
         self.code = code
-        self.details = details or {}
+        self.details = details if details is not None else _NO_DETAILS
         super().__init__(message)
 
 
@@ -1,12 +1,83 @@
-"""Guard context managers for common validation patterns."""
+"""Guards for common validation patterns.
+
+The ``ensure_*`` functions are plain checks that return the validated value or
+raise; use them on request hot paths. The ``guard_*`` context managers wrap the
+same checks for callers that prefer a ``with`` block.
+"""
 
 from contextlib import contextmanager
-from typing import Any, Iterator, Optional
+from typing import Iterator, Optional, TypeVar
 
 from sqlalchemy.exc import NoResultFound
 
 from app.core.exceptions import AuthManagerError, UnauthorizedError, ValidationError
 
+T = TypeVar("T")
+
+
+def ensure_authorization(value: Optional[str]) -> str:
+    """Ensure the authorization header is present.
+
+    Args:
+        value: The authorization header value
+
+    Returns:
+        str: The authorization header value
+
+    Raises:
+        UnauthorizedError: If authorization header is missing
+    """
+    if not value:
+        raise UnauthorizedError("Authorization header is required")
+    return value
+
+
+def ensure_not_none(
+    value: Optional[T], error_message: str, error_code: str = "validation_error"
+) -> T:
+    """Ensure a value is not None.
+
+    Args:
+        value: The value to check
+        error_message: Error message if value is None
+        error_code: Error code for the exception
+
+    Returns:
+        The non-None value
+
+    Raises:
+        ValidationError: If value is None and error_code is "validation_error"
+        AuthManagerError: If value is None and a different error_code is given
+
+    Example:
+        user_id = ensure_not_none(token_info.sub, "Token missing required claim: sub")
+    """
+    if value is None:
+        if error_code == "validation_error":
+            raise ValidationError(error_message, {"field": "value"})
+        raise AuthManagerError(error_message, error_code)
+    return value
+
+
+def ensure_condition(
+    condition: bool, error_message: str, error_code: str = "validation_error"
+) -> None:
+    """Ensure a condition is true.
+
+    Args:
+        condition: The condition to check
+        error_message: Error message if condition is false
+        error_code: Error code for the exception
+
+    Raises:
+        AuthManagerError: If condition is false
+
+    Example:
+        ensure_condition(token.active, "Token is not active", "token_not_active")
+    """
+    if not condition:
+        raise AuthManagerError(error_message, error_code)
+
 
 @contextmanager
 def guard_authorization(value: Optional[str]) -> Iterator[str]:
@@ -26,33 +97,33 @@ def guard_authorization(value: Optional[str]) -> Iterator[str]:
             # Use auth_header safely
             pass
     """
-    if not value:
-        raise UnauthorizedError("Authorization header is required")
-    yield value
+    yield ensure_authorization(value)
 
 
 @contextmanager
-def guard_not_none(value: Optional[Any], error_message: str) -> Iterator[Any]:
+def guard_not_none(
+    value: Optional[T], error_message: str, error_code: str = "validation_error"
+) -> Iterator[T]:
     """Guard that ensures a value is not None.
 
     Args:
         value: The value to check
         error_message: Error message if value is None
+        error_code: Error code for the exception
 
     Yields:
-        Any: The non-None value
+        The non-None value
 
     Raises:
-        ValidationError: If value is None
+        ValidationError: If value is None and error_code is "validation_error"
+        AuthManagerError: If value is None and a different error_code is given
 
     Example:
         with guard_not_none(user_id, "User ID is required") as uid:
             # Use uid safely
             pass
     """
-    if value is None:
-        raise ValidationError(error_message, {"field": "value"})
-    yield value
+    yield ensure_not_none(value, error_message, error_code)
 
 
 @contextmanager
@@ -101,6 +172,5 @@ def guard_condition(
             # Proceed with active token
             pass
     """
-    if not condition:
-        raise AuthManagerError(error_message, error_code)
+    ensure_condition(condition, error_message, error_code)
     yield
@@ -0,0 +1,54 @@
+"""Shared outbound HTTP client."""
+
+import httpx
+
+# Keep idle connections to Keycloak open between requests so token calls
+# reuse an established TCP/TLS connection instead of handshaking each time.
+# HTTP/2 (negotiated over TLS) lets concurrent calls share one connection.
+HTTP_LIMITS = httpx.Limits(
+    max_connections=100,
+    max_keepalive_connections=50,
+    keepalive_expiry=60.0,
+)
+
+# Fail fast when Keycloak is unreachable or the pool is exhausted, while
+# leaving slow token responses the full read timeout.
+HTTP_TIMEOUT = httpx.Timeout(30.0, connect=5.0, write=10.0, pool=5.0)
+
+
+def create_http_client() -> httpx.AsyncClient:
+    """Create an httpx client with the service's pooling, HTTP/2 and timeouts."""
+    return httpx.AsyncClient(
+        timeout=HTTP_TIMEOUT,
+        limits=HTTP_LIMITS,
+        http2=True,
+        headers={"Accept": "application/json"},
+    )
+
+
+class HTTPClientManager:
+    """Manages the lifecycle of the process-wide httpx client."""
+
+    def __init__(self):
+        self._client: httpx.AsyncClient | None = None
+
+    def init(self):
+        """Create the shared client if it is not already open."""
+        if self._client is None or self._client.is_closed:
+            self._client = create_http_client()
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Return the shared client, creating it on first use."""
+        self.init()
+        return self._client
+
+    async def close(self):
+        """Close the shared client and its pooled connections."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+# Global HTTP client manager
+http_client_manager = HTTPClientManager()
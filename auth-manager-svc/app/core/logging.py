@@ -1,23 +1,228 @@
 """Logging configuration using structlog."""
 
+import atexit
 import logging
+import queue
 import sys
-from typing import Any
+import threading
+import time
+from datetime import UTC, datetime
+from typing import Any, BinaryIO
 
+import orjson
 import structlog
 from structlog.types import EventDict
 
+# Method names whose level is reported under another name, as structlog does
+_LEVEL_ALIASES = {"warn": "warning", "exception": "error"}
 
-def add_app_context(logger: Any, method_name: str, event_dict: EventDict) -> EventDict:
+_render_stack_info = structlog.processors.StackInfoRenderer()
+
+# Second of the last timestamp and its formatted "YYYY-MM-DDTHH:MM:SS" prefix
+_timestamp_second: tuple[int, str] = (-1, "")
+
+
+def _utc_timestamp() -> str:
+    """Current UTC time in ISO format, formatting the date part once per second."""
+    global _timestamp_second
+    seconds, micros = divmod(time.time_ns() // 1000, 1_000_000)
+    second, prefix = _timestamp_second
+    if second != seconds:
+        prefix = datetime.fromtimestamp(seconds, UTC).strftime("%Y-%m-%dT%H:%M:%S")
+        _timestamp_second = (seconds, prefix)
+    return f"{prefix}.{micros:06d}Z"
+
+
+def add_standard_fields(logger: Any, method_name: str, event_dict: EventDict) -> EventDict:
     """
-    Add application context to log entries.
+    Add the standard fields to a log entry in a single processor.
 
-    This processor adds standard application metadata to every log entry.
+    Merges the request context, then adds level, logger name, UTC timestamp
+    and application context. Stack info and exception tracebacks are only
+    rendered when the entry carries them, so ordinary log calls skip both.
     """
+    structlog.contextvars.merge_contextvars(logger, method_name, event_dict)
+
+    event_dict["level"] = _LEVEL_ALIASES.get(method_name, method_name)
+    record = event_dict.get("_record")
+    event_dict["logger"] = logger.name if record is None else record.name
+    event_dict["timestamp"] = _utc_timestamp()
     event_dict["app"] = "auth-manager-service"
+
+    if "stack_info" in event_dict:
+        event_dict = _render_stack_info(logger, method_name, event_dict)
+    if "exc_info" in event_dict:
+        event_dict = structlog.processors.format_exc_info(logger, method_name, event_dict)
     return event_dict
 
 
+def orjson_dumps(obj: Any, **kwargs: Any) -> bytes:
+    """
+    Serialize a log event with orjson for structlog's JSONRenderer.
+
+    JSONRenderer passes a ``default`` fallback for objects orjson cannot encode
+    natively; non-string keys are stringified like ``json.dumps`` does.
+    """
+    return orjson.dumps(obj, default=kwargs.get("default"), option=orjson.OPT_NON_STR_KEYS)
+
+
+def _orjson_dumps_str(obj: Any, **kwargs: Any) -> str:
+    """orjson serializer for the stdlib formatter, which expects text."""
+    return orjson_dumps(obj, **kwargs).decode()
+
+
+class LogWriter:
+    """
+    Writes rendered log lines to stdout, off the request path.
+
+    Once started, log calls only enqueue their line and a background thread
+    writes whatever has accumulated with a single write() per batch. Before
+    ``start()`` and after ``stop()`` lines are written synchronously, so
+    scripts and tests that never run the lifespan still see their logs.
+
+    The queue is bounded: when stdout cannot keep up, new lines are dropped
+    and counted in ``dropped`` rather than growing memory without limit, and
+    the writer reports the count in a warning line once it catches up.
+    Queued lines are flushed by ``stop()``, which also runs at interpreter exit.
+    """
+
+    # Maximum number of queued lines joined into one write
+    max_batch = 512
+
+    def __init__(self, stream: BinaryIO | None = None, max_queued: int = 10_000):
+        self._stream = stream
+        self._queue: queue.Queue[bytes | None] = queue.Queue(maxsize=max_queued)
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self._atexit_registered = False
+        # Lines dropped on a full queue, in total and since the last report.
+        # Separate from the write lock, so dropping never waits on the stream.
+        self.dropped = 0
+        self._unreported = 0
+        self._dropped_lock = threading.Lock()
+
+    def write(self, line: bytes) -> None:
+        """Write one newline-terminated log line."""
+        if self._thread is None:
+            self._write(line)
+            return
+
+        try:
+            self._queue.put_nowait(line)
+        except queue.Full:
+            with self._dropped_lock:
+                self.dropped += 1
+                self._unreported += 1
+
+    def start(self) -> None:
+        """Start the background writer thread if it is not running."""
+        if self._thread is None:
+            if not self._atexit_registered:
+                # The thread is a daemon, so flush what is queued before exit
+                atexit.register(self.stop)
+                self._atexit_registered = True
+            self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Flush queued lines and stop the writer thread."""
+        thread = self._thread
+        if thread is None:
+            return
+
+        # New lines are written directly from here on
+        self._thread = None
+        self._queue.put(None)
+        thread.join()
+
+        # Lines enqueued while the thread was shutting down
+        while True:
+            try:
+                line = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if line is not None:
+                self._write(line)
+        self._report_dropped()
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.max_batch:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            lines = [line for line in batch if line is not None]
+            if lines:
+                self._write(b"".join(lines))
+            self._report_dropped()
+            if len(lines) != len(batch):
+                return
+
+    def _report_dropped(self) -> None:
+        """Write a warning line for lines dropped since the last report, if any."""
+        if not self._unreported:
+            return
+        with self._dropped_lock:
+            count, self._unreported = self._unreported, 0
+        line = {
+            "event": "log_lines_dropped",
+            "dropped": count,
+            "level": "warning",
+            "logger": __name__,
+            "timestamp": _utc_timestamp(),
+            "app": "auth-manager-service",
+        }
+        self._write(orjson.dumps(line) + b"\n")
+
+    def _write(self, data: bytes) -> None:
+        stream = self._stream or sys.stdout.buffer
+        with self._lock:
+            try:
+                stream.write(data)
+                stream.flush()
+            except (OSError, ValueError):
+                # stdout closed or broken pipe; logging must never raise
+                pass
+
+
+# Global log writer shared by structlog and stdlib logging
+log_writer = LogWriter()
+
+
+class _WriterLogger:
+    """structlog logger handing rendered JSON lines to the log writer."""
+
+    __slots__ = ("name",)
+
+    def __init__(self, name: str | None = None):
+        # Read by structlog.stdlib.add_logger_name
+        self.name = name
+
+    def msg(self, message: bytes) -> None:
+        log_writer.write(message + b"\n")
+
+    log = debug = info = warn = warning = msg
+    fatal = failure = err = error = critical = exception = msg
+
+
+def _writer_logger_factory(*args: Any) -> _WriterLogger:
+    """Logger factory passing the ``get_logger`` name to the logger."""
+    return _WriterLogger(args[0] if args else None)
+
+
+class _WriterHandler(logging.Handler):
+    """stdlib handler handing formatted records to the log writer."""
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            log_writer.write(self.format(record).encode() + b"\n")
+        except Exception:
+            self.handleError(record)
+
+
 def configure_logging(log_level: str = "INFO") -> None:
     """
     Configure structlog for structured logging with JSON output.
@@ -31,6 +236,12 @@ def configure_logging(log_level: str = "INFO") -> None:
     - Consistent field naming
     - Context preservation across log calls
 
+    Application loggers render JSON and hand it directly to ``log_writer``,
+    skipping stdlib LogRecords, formatters and handler locks. Only logs from
+    other libraries (uvicorn, sqlalchemy) go through the stdlib root handler,
+    which feeds the same writer. Call ``log_writer.start()`` to move stdout
+    writes to a background thread.
+
     Args:
         log_level: The logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
 
@@ -42,53 +253,37 @@ def configure_logging(log_level: str = "INFO") -> None:
     # Convert string log level to logging constant
     numeric_level = getattr(logging, log_level.upper(), logging.INFO)
 
-    # Shared processors for both structlog and stdlib logging
-    shared_processors = [
-        # Add context from thread-local storage
-        structlog.contextvars.merge_contextvars,
-        # Add log level
-        structlog.stdlib.add_log_level,
-        # Add logger name
-        structlog.stdlib.add_logger_name,
-        # Add timestamp in ISO format with UTC
-        structlog.processors.TimeStamper(fmt="iso", utc=True),
-        # Add application context
-        add_app_context,
-        # Format stack info if present
-        structlog.processors.StackInfoRenderer(),
-        # Format exceptions with full traceback
-        structlog.processors.format_exc_info,
-        # Ensure proper unicode handling
-        structlog.processors.UnicodeDecoder(),
-    ]
-
     # Configure structlog
     structlog.configure(
-        processors=shared_processors
-        + [
-            # Prepare for stdlib logging
-            structlog.stdlib.ProcessorFormatter.wrap_for_formatter,
+        processors=[
+            # Add context, level, logger name, timestamp and app context, and
+            # format stack info and exceptions when present
+            add_standard_fields,
+            # Render to JSON bytes with orjson
+            structlog.processors.JSONRenderer(serializer=orjson_dumps),
         ],
-        # Use stdlib logging as the backend
-        logger_factory=structlog.stdlib.LoggerFactory(),
+        # Hand rendered lines straight to the log writer, bypassing stdlib logging
+        logger_factory=_writer_logger_factory,
+        # Calls below the configured level return immediately, before any
+        # processor runs
+        wrapper_class=structlog.make_filtering_bound_logger(numeric_level),
         # Cache logger instances for performance
         cache_logger_on_first_use=True,
     )
 
-    # Configure stdlib logging to use structlog's formatter
+    # Configure stdlib logging for non-structlog loggers (e.g., uvicorn, sqlalchemy)
     formatter = structlog.stdlib.ProcessorFormatter(
-        # Process logs from non-structlog loggers (e.g., uvicorn, sqlalchemy)
-        foreign_pre_chain=shared_processors,
+        foreign_pre_chain=[add_standard_fields],
         processors=[
             # Remove internal structlog metadata
             structlog.stdlib.ProcessorFormatter.remove_processors_meta,
-            # Render to JSON
-            structlog.processors.JSONRenderer(),
+            # Render to JSON with orjson
+            structlog.processors.JSONRenderer(serializer=_orjson_dumps_str),
         ],
     )
 
     # Set up the root logger
-    handler = logging.StreamHandler(sys.stdout)
+    handler = _WriterHandler()
     handler.setFormatter(formatter)
     handler.setLevel(numeric_level)
 
@@ -103,7 +298,7 @@ def configure_logging(log_level: str = "INFO") -> None:
     logging.getLogger("sqlalchemy.engine").setLevel(logging.WARNING)  # Reduce SQL noise
 
 
-def get_logger(name: str | None = None) -> structlog.stdlib.BoundLogger:
+def get_logger(name: str | None = None) -> structlog.typing.FilteringBoundLogger:
     """
     Get a structlog logger instance.
 
@@ -1,6 +1,6 @@
 """SQLAlchemy base configuration and session management."""
 
-from typing import AsyncGenerator
+from typing import Any, AsyncGenerator, Dict
 
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
@@ -9,6 +9,7 @@ from sqlalchemy.ext.asyncio import (
     create_async_engine,
 )
 from sqlalchemy.orm import declarative_base
+from sqlalchemy.pool import NullPool
 
 Base = declarative_base()
 
@@ -19,23 +20,49 @@ class DatabaseSessionManager:
     def __init__(self):
         self._engine: AsyncEngine | None = None
         self._session_maker: async_sessionmaker[AsyncSession] | None = None
+        self._read_session_maker: async_sessionmaker[AsyncSession] | None = None
 
     def init(
         self,
         database_url: str,
-        pool_size: int = 10,
-        max_overflow: int = 20,
+        pool_size: int = 20,
+        max_overflow: int = 40,
         pool_timeout: int = 30,
+        pool_recycle: int = 1800,
+        pool_pre_ping: bool = False,
+        null_pool: bool = False,
+        jit: bool = False,
         echo: bool = False,
+        prepared_statement_cache_size: int = 256,
     ):
         """Initialize database engine and session maker."""
+        connect_args: Dict[str, Any] = {
+            # asyncpg prepares every statement; keep the hot ones (vault lookup by
+            # id, readiness probe) so repeats skip PostgreSQL's parse/plan step.
+            "prepared_statement_cache_size": prepared_statement_cache_size,
+        }
+        if not jit:
+            # The vault's single-row lookups never amortize JIT compilation
+            connect_args["server_settings"] = {"jit": "off"}
+
+        if null_pool:
+            # PgBouncer owns the pooling; sizing options do not apply to NullPool
+            pool_args: Dict[str, Any] = {"poolclass": NullPool}
+        else:
+            pool_args = {
+                "pool_size": pool_size,
+                "max_overflow": max_overflow,
+                "pool_timeout": pool_timeout,
+                "pool_recycle": pool_recycle,
+            }
+
         self._engine = create_async_engine(
             database_url,
-            pool_size=pool_size,
-            max_overflow=max_overflow,
-            pool_timeout=pool_timeout,
+            pool_pre_ping=pool_pre_ping,
             echo=echo,
             future=True,
+            connect_args=connect_args,
+            **pool_args,
         )
 
         self._session_maker = async_sessionmaker(
@@ -45,6 +72,14 @@ class DatabaseSessionManager:
             autocommit=False,
             autoflush=False,
         )
+        # Read-only sessions run in autocommit mode: asyncpg then sends no
+        # BEGIN before the first query and nothing needs committing afterwards.
+        self._read_session_maker = async_sessionmaker(
+            self._engine.execution_options(isolation_level="AUTOCOMMIT"),
+            class_=AsyncSession,
+            expire_on_commit=False,
+            autoflush=False,
+        )
 
     async def close(self):
         """Close database engine."""
@@ -52,6 +87,7 @@ class DatabaseSessionManager:
             await self._engine.dispose()
             self._engine = None
             self._session_maker = None
+            self._read_session_maker = None
 
     async def session(self) -> AsyncGenerator[AsyncSession, None]:
         """Get async database session."""
@@ -68,6 +104,18 @@ class DatabaseSessionManager:
             finally:
                 await session.close()
 
+    async def read_session(self) -> AsyncGenerator[AsyncSession, None]:
+        """Get async database session for read-only work.
+
+        Each statement commits on its own, so the session must not be used
+        for writes that need to be atomic.
+        """
+        if self._read_session_maker is None:
+            raise RuntimeError("Database not initialized")
+
+        async with self._read_session_maker() as session:
+            yield session
+
 
 # Global database session manager
 db_manager = DatabaseSessionManager()
@@ -1,13 +1,13 @@
 """SQLAlchemy ORM models."""
 
 import enum
-import uuid
 
-from sqlalchemy import Column, DateTime, Index, Text
+from sqlalchemy import Column, DateTime, Index, Text, text
 from sqlalchemy import Enum as SQLEnum
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.sql import func
 
+from app.core.ids import uuid7
 from app.db.base import Base
 
 
@@ -18,16 +18,30 @@ class TokenType(str, enum.Enum):
     REFRESH = "refresh"
 
 
+# Predicate of the partial unique index on refresh tokens. ON CONFLICT must
+# repeat it verbatim (not as a bound parameter) for Postgres to infer the index.
+REFRESH_TOKEN_PREDICATE = text("token_type = 'refresh'")
+
+
 class AuthVault(Base):
     """Auth vault table for storing encrypted tokens."""
 
     __tablename__ = "auth_vault"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     user_id = Column(UUID(as_uuid=True), nullable=False)
-    token_type = Column(SQLEnum(TokenType, name="auth_token_type"), nullable=False)
-    encrypted_token = Column(Text, nullable=True)
-    iv = Column(Text, nullable=True)
+    # Store the enum values ('offline', 'refresh') that the migration defines
+    # for auth_token_type, not the member names SQLEnum sends by default.
+    token_type = Column(
+        SQLEnum(
+            TokenType,
+            name="auth_token_type",
+            values_callable=lambda members: [member.value for member in members],
+        ),
+        nullable=False,
+    )
+    encrypted_token = Column(Text, nullable=False)
+    iv = Column(Text, nullable=False)
     token_hash = Column(Text, nullable=True)
     token_metadata = Column("metadata", JSONB, nullable=True)
     session_state_id = Column(Text, nullable=False)
@@ -35,9 +49,19 @@ class AuthVault(Base):
     updated_at = Column(DateTime(timezone=True), onupdate=func.now(), nullable=True)
 
     __table_args__ = (
-        Index("auth_vault_user_id_token_type_idx", "user_id", "token_type"),
+        Index(
+            "auth_vault_user_id_token_type_created_at_idx", "user_id", "token_type", "created_at"
+        ),
         Index("auth_vault_session_state_idx", "session_state_id"),
-        Index("auth_vault_token_hash_idx", "token_hash"),
+        Index("auth_vault_token_hash_idx", "token_hash", postgresql_using="hash"),
+        # At most one refresh token per user; also the ON CONFLICT arbiter
+        # for TokenVaultRepository.upsert_refresh_token.
+        Index(
+            "auth_vault_user_refresh_token_uidx",
+            "user_id",
+            unique=True,
+            postgresql_where=REFRESH_TOKEN_PREDICATE,
+        ),
     )
 
     def __repr__(self):
@@ -1,25 +1,131 @@
 """Token vault repository for database operations."""
 
+import logging
 import time
-from typing import List, Optional
+from typing import Any, Callable, List, Optional, Sequence
 from uuid import UUID
 
-from sqlalchemy import and_, delete, select, update
+from pydantic import TypeAdapter
+from sqlalchemy import (
+    BigInteger,
+    Select,
+    and_,
+    bindparam,
+    delete,
+    event,
+    exists,
+    func,
+    insert,
+    select,
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.logging import get_logger
-from app.db.models import AuthVault, TokenType
-from app.models.domain import TokenVaultEntry
+from app.db.models import REFRESH_TOKEN_PREDICATE, AuthVault, TokenType
+from app.models.domain import TokenVaultCore, TokenVaultEntry
 
 logger = get_logger(__name__)
 
 
+_ENTRY_LIST_ADAPTER = TypeAdapter(List[TokenVaultEntry])
+
+
+def _newest_by(column: Any, with_token_type: bool) -> Select:
+    """Build a query for the newest entry matching ``column``, by token type if asked."""
+    query = select(AuthVault).where(column == bindparam("key"))
+    if with_token_type:
+        query = query.where(AuthVault.token_type == bindparam("token_type"))
+    return query.order_by(AuthVault.created_at.desc()).limit(1)
+
+
+# Statements for the hot lookups are built once with bound parameters, so
+# calls only supply values instead of rebuilding the expression each time.
+_NEWEST_BY_USER = _newest_by(AuthVault.user_id, with_token_type=False)
+_NEWEST_BY_USER_AND_TYPE = _newest_by(AuthVault.user_id, with_token_type=True)
+_NEWEST_BY_SESSION = _newest_by(AuthVault.session_state_id, with_token_type=False)
+_NEWEST_BY_SESSION_AND_TYPE = _newest_by(AuthVault.session_state_id, with_token_type=True)
+
+_HASH_EXISTS = select(
+    exists().where(
+        and_(
+            AuthVault.token_hash == bindparam("token_hash"),
+            AuthVault.id != bindparam("exclude_id"),
+        )
+    )
+)
+
+# Both sharing checks as one SELECT of two EXISTS subqueries, one round trip
+_SHARED_TOKEN_EXISTS = select(
+    exists().where(
+        and_(
+            AuthVault.token_hash == bindparam("token_hash"),
+            AuthVault.id != bindparam("exclude_id"),
+        )
+    ),
+    exists().where(
+        and_(
+            AuthVault.session_state_id == bindparam("session_state_id"),
+            AuthVault.id != bindparam("exclude_id"),
+        )
+    ),
+)
+
+_DELETE_BY_ID = delete(AuthVault).where(AuthVault.id == bindparam("token_id"))
+
+# Transaction-scoped advisory lock, released by Postgres on commit or rollback
+_LOCK_USER_REFRESH_TOKEN = select(
+    func.pg_advisory_xact_lock(bindparam("lock_key", type_=BigInteger))
+)
+
+# Column projection for TokenVaultCore, in its field order
+_CORE_COLUMNS = select(
+    AuthVault.id,
+    AuthVault.token_type,
+    AuthVault.session_state_id,
+    AuthVault.encrypted_token,
+    AuthVault.iv,
+)
+_CORE_BY_ID = _CORE_COLUMNS.where(AuthVault.id == bindparam("token_id"))
+
+
+def _to_entry(row: AuthVault) -> TokenVaultEntry:
+    """Convert an ORM row to a TokenVaultEntry.
+
+    Validates the row's loaded column values straight from its ``__dict__``,
+    skipping instrumented attribute access. Rows handed in here come fresh
+    from a query and sessions do not expire on commit, so every column is loaded.
+    """
+    return TokenVaultEntry.model_validate(row.__dict__)
+
+
+def _to_entries(rows: Sequence[AuthVault]) -> List[TokenVaultEntry]:
+    """Convert ORM rows to TokenVaultEntry objects in one validator call."""
+    return _ENTRY_LIST_ADAPTER.validate_python([row.__dict__ for row in rows])
+
+
+def _advisory_lock_key(user_id: UUID) -> int:
+    """Map a user ID onto the signed 64-bit key space of Postgres advisory locks."""
+    return int.from_bytes(user_id.bytes[:8], "big", signed=True)
+
+
+def _debug_enabled() -> bool:
+    """Whether query debug logs are emitted, so timing can be skipped otherwise."""
+    return logger.is_enabled_for(logging.DEBUG)
+
+
 class TokenVaultRepository:
     """Repository for token vault database operations."""
 
     def __init__(self, session: AsyncSession):
         self.session = session
 
+    def on_commit(self, callback: Callable[[], None]) -> None:
+        """Run ``callback`` once the session's current transaction commits."""
+        event.listen(
+            self.session.sync_session, "after_commit", lambda _session: callback(), once=True
+        )
+
     async def create(
         self,
         user_id: UUID,
@@ -31,80 +137,115 @@ class TokenVaultRepository:
         metadata: Optional[dict] = None,
     ) -> TokenVaultEntry:
         """Create a new token vault entry."""
-        start_time = time.time()
-        logger.debug(
-            "db_query",
-            operation="create",
-            user_id=str(user_id),
-            token_type=token_type.value,
-        )
+        debug = _debug_enabled()
+        start_time = time.perf_counter() if debug else 0.0
 
-        entry = AuthVault(
-            user_id=user_id,
-            token_type=token_type,
-            encrypted_token=encrypted_token,
-            iv=iv,
-            token_hash=token_hash,
-            session_state_id=session_state_id,
-            metadata=metadata,
-        )
-        self.session.add(entry)
-        await self.session.flush()
-        await self.session.refresh(entry)
-
-        duration_ms = (time.time() - start_time) * 1000
-        logger.debug(
-            "db_query_complete",
-            operation="create",
-            token_id=str(entry.id),
-            duration_ms=round(duration_ms, 2),
+        # INSERT ... RETURNING fetches server defaults in the same round trip
+        # instead of a flush followed by a refresh SELECT.
+        entry = await self.session.scalar(
+            insert(AuthVault)
+            .values(
+                user_id=user_id,
+                token_type=token_type,
+                encrypted_token=encrypted_token,
+                iv=iv,
+                token_hash=token_hash,
+                session_state_id=session_state_id,
+                token_metadata=metadata,
+            )
+            .returning(AuthVault)
         )
 
-        return TokenVaultEntry.model_validate(entry)
+        if debug:
+            logger.debug(
+                "db_query_complete",
+                operation="create",
+                user_id=str(user_id),
+                token_type=token_type.value,
+                token_id=str(entry.id),
+                duration_ms=round((time.perf_counter() - start_time) * 1000, 2),
+            )
+
+        return _to_entry(entry)
 
     async def get_by_id(self, token_id: UUID) -> Optional[TokenVaultEntry]:
         """Retrieve token by persistent token ID."""
-        start_time = time.time()
-        logger.debug("db_query", operation="get_by_id", token_id=str(token_id))
-
-        result = await self.session.execute(select(AuthVault).where(AuthVault.id == token_id))
-        entry = result.scalar_one_or_none()
-
-        duration_ms = (time.time() - start_time) * 1000
-        logger.debug(
-            "db_query_complete",
-            operation="get_by_id",
-            token_id=str(token_id),
-            found=entry is not None,
-            duration_ms=round(duration_ms, 2),
-        )
+        debug = _debug_enabled()
+        start_time = time.perf_counter() if debug else 0.0
+
+        # Primary-key lookup: answered from the session's identity map when the
+        # row is already loaded, otherwise a single-row SELECT
+        entry = await self.session.get(AuthVault, token_id)
+
+        if debug:
+            logger.debug(
+                "db_query_complete",
+                operation="get_by_id",
+                token_id=str(token_id),
+                found=entry is not None,
+                duration_ms=round((time.perf_counter() - start_time) * 1000, 2),
+            )
+
+        return _to_entry(entry) if entry else None
 
-        return TokenVaultEntry.model_validate(entry) if entry else None
+    async def get_core_by_id(self, token_id: UUID) -> Optional[TokenVaultCore]:
+        """Retrieve the columns needed to use a stored token by its persistent ID.
+
+        Selects only those columns as a plain row, so no ORM instance is built,
+        the metadata JSON is not decoded and no Pydantic validation runs.
+        """
+        debug = _debug_enabled()
+        start_time = time.perf_counter() if debug else 0.0
+
+        row = (await self.session.execute(_CORE_BY_ID, {"token_id": token_id})).first()
+
+        if debug:
+            logger.debug(
+                "db_query_complete",
+                operation="get_core_by_id",
+                token_id=str(token_id),
+                found=row is not None,
+                duration_ms=round((time.perf_counter() - start_time) * 1000, 2),
+            )
+
+        return TokenVaultCore(*row) if row else None
+
+    async def lock_user_refresh_token(self, user_id: UUID) -> None:
+        """Block until no other transaction is rotating this user's refresh token.
+
+        Takes ``pg_advisory_xact_lock``, so the lock holds across processes and
+        replicas until the current transaction commits or rolls back. The
+        session must therefore be a transactional one, not an autocommit one.
+        """
+        await self.session.execute(
+            _LOCK_USER_REFRESH_TOKEN, {"lock_key": _advisory_lock_key(user_id)}
+        )
 
     async def get_by_user_id(
         self, user_id: UUID, token_type: Optional[TokenType] = None
     ) -> Optional[TokenVaultEntry]:
         """Get token by user ID and optionally token type."""
-        query = select(AuthVault).where(AuthVault.user_id == user_id)
+        # Served by a backward scan of (user_id, token_type, created_at)
         if token_type:
-            query = query.where(AuthVault.token_type == token_type)
-        query = query.order_by(AuthVault.created_at.desc())
-
-        result = await self.session.execute(query)
-        entry = result.scalar_one_or_none()
-        return TokenVaultEntry.model_validate(entry) if entry else None
+            entry = await self.session.scalar(
+                _NEWEST_BY_USER_AND_TYPE, {"key": user_id, "token_type": token_type}
+            )
+        else:
+            entry = await self.session.scalar(_NEWEST_BY_USER, {"key": user_id})
+        return _to_entry(entry) if entry else None
 
     async def get_by_session_state_id(
         self, session_state_id: str, token_type: Optional[TokenType] = None
     ) -> Optional[TokenVaultEntry]:
         """Get token by session state ID."""
-        query = select(AuthVault).where(AuthVault.session_state_id == session_state_id)
+        # A session can hold several tokens of a type; return the newest
         if token_type:
-            query = query.where(AuthVault.token_type == token_type)
-
-        result = await self.session.execute(query)
-        entry = result.scalar_one_or_none()
-        return TokenVaultEntry.model_validate(entry) if entry else None
+            entry = await self.session.scalar(
+                _NEWEST_BY_SESSION_AND_TYPE, {"key": session_state_id, "token_type": token_type}
+            )
+        else:
+            entry = await self.session.scalar(_NEWEST_BY_SESSION, {"key": session_state_id})
+        return _to_entry(entry) if entry else None
 
     async def get_all_by_session_state_id(
         self,
@@ -120,20 +261,34 @@ class TokenVaultRepository:
             query = query.where(AuthVault.token_type == token_type)
 
         result = await self.session.execute(query)
-        entries = result.scalars().all()
-        return [TokenVaultEntry.model_validate(e) for e in entries]
+        return _to_entries(result.scalars().all())
 
     async def check_duplicate_token_hash(self, token_hash: str, exclude_id: UUID) -> bool:
         """Check if token hash exists (excluding specific ID)."""
-        result = await self.session.execute(
-            select(AuthVault).where(
-                and_(
-                    AuthVault.token_hash == token_hash,
-                    AuthVault.id != exclude_id,
-                )
-            )
+        # SELECT EXISTS returns one boolean instead of transferring whole rows
+        return await self.session.scalar(
+            _HASH_EXISTS, {"token_hash": token_hash, "exclude_id": exclude_id}
         )
-        return result.scalar_one_or_none() is not None
+
+    async def check_shared_token(
+        self, token_hash: str, session_state_id: str, exclude_id: UUID
+    ) -> tuple[bool, bool]:
+        """Check whether other entries share the token hash or the session state ID.
+
+        Returns:
+            Tuple of (has_duplicate_hash, has_shared_session)
+        """
+        row = (
+            await self.session.execute(
+                _SHARED_TOKEN_EXISTS,
+                {
+                    "token_hash": token_hash,
+                    "session_state_id": session_state_id,
+                    "exclude_id": exclude_id,
+                },
+            )
+        ).one()
+        return row[0], row[1]
 
     async def upsert_refresh_token(
         self,
@@ -144,52 +299,65 @@ class TokenVaultRepository:
         session_state_id: str,
         metadata: Optional[dict] = None,
     ) -> str:
-        """Upsert refresh token (ensure only one per user)."""
-        # Check if refresh token exists for user
-        existing = await self.get_by_user_id(user_id, TokenType.REFRESH)
+        """Upsert refresh token (ensure only one per user).
 
-        if existing:
-            # Update existing
-            await self.session.execute(
-                update(AuthVault)
-                .where(AuthVault.id == existing.id)
-                .values(
-                    encrypted_token=encrypted_token,
-                    iv=iv,
-                    token_hash=token_hash,
-                    session_state_id=session_state_id,
-                    metadata=metadata,
-                )
-            )
-            return str(existing.id)
-        else:
-            # Create new
-            entry = await self.create(
-                user_id=user_id,
-                token_type=TokenType.REFRESH,
-                encrypted_token=encrypted_token,
-                iv=iv,
-                token_hash=token_hash,
-                session_state_id=session_state_id,
-                metadata=metadata,
+        Runs as a single ``INSERT ... ON CONFLICT DO UPDATE ... RETURNING id``
+        against the partial unique index on refresh tokens, so concurrent
+        upserts for the same user cannot both insert.
+        """
+        debug = _debug_enabled()
+        start_time = time.perf_counter() if debug else 0.0
+
+        stmt = pg_insert(AuthVault).values(
+            user_id=user_id,
+            token_type=TokenType.REFRESH,
+            encrypted_token=encrypted_token,
+            iv=iv,
+            token_hash=token_hash,
+            session_state_id=session_state_id,
+            token_metadata=metadata,
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[AuthVault.user_id],
+            index_where=REFRESH_TOKEN_PREDICATE,
+            set_={
+                "encrypted_token": stmt.excluded.encrypted_token,
+                "iv": stmt.excluded.iv,
+                "token_hash": stmt.excluded.token_hash,
+                "session_state_id": stmt.excluded.session_state_id,
+                "metadata": stmt.excluded.metadata,
+                "updated_at": func.now(),
+            },
+        ).returning(AuthVault.id)
+
+        token_id = await self.session.scalar(stmt)
+
+        if debug:
+            logger.debug(
+                "db_query_complete",
+                operation="upsert_refresh_token",
+                user_id=str(user_id),
+                token_id=str(token_id),
+                duration_ms=round((time.perf_counter() - start_time) * 1000, 2),
             )
-            return str(entry.id)
+
+        return str(token_id)
 
     async def delete_by_id(self, token_id: UUID) -> bool:
         """Delete token by ID."""
-        start_time = time.time()
-        logger.debug("db_query", operation="delete_by_id", token_id=str(token_id))
+        debug = _debug_enabled()
+        start_time = time.perf_counter() if debug else 0.0
 
-        result = await self.session.execute(delete(AuthVault).where(AuthVault.id == token_id))
+        result = await self.session.execute(_DELETE_BY_ID, {"token_id": token_id})
         deleted = result.rowcount > 0
 
-        duration_ms = (time.time() - start_time) * 1000
-        logger.debug(
-            "db_query_complete",
-            operation="delete_by_id",
-            token_id=str(token_id),
-            deleted=deleted,
-            duration_ms=round(duration_ms, 2),
-        )
+        if debug:
+            logger.debug(
+                "db_query_complete",
+                operation="delete_by_id",
+                token_id=str(token_id),
+                deleted=deleted,
+                duration_ms=round((time.perf_counter() - start_time) * 1000, 2),
+            )
 
         return deleted
@@ -8,12 +8,15 @@ Requirements:
     - 17.3: Use FastAPI's dependency injection for database session management
 """
 
+from functools import lru_cache
 from typing import Annotated, AsyncGenerator
 
+import httpx
 from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import get_settings
+from app.core.http import http_client_manager
 from app.db.base import db_manager
 from app.db.repositories.token_vault import TokenVaultRepository
 from app.services.encryption import EncryptionService
@@ -28,18 +31,44 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
         yield session
 
 
+async def get_read_db() -> AsyncGenerator[AsyncSession, None]:
+    """Yield a read-only database session, to be used as a dependency."""
+    async for session in db_manager.read_session():
+        yield session
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Get the shared outbound HTTP client for the services built below.
+
+    Returns the process-wide client opened in the application lifespan, so
+    callers reuse its pooled Keycloak connections instead of handshaking anew.
+    """
+    return http_client_manager.client
+
+
+# The services below only hold configuration and shared clients, so one
+# instance per process is built on first use and reused across requests.
+
+
+@lru_cache(maxsize=1)
 def get_encryption_service() -> EncryptionService:
     """Dependency for getting the encryption service."""
     settings = get_settings()
-    return EncryptionService(settings.encryption.token_vault_encryption_key)
+    return EncryptionService(settings.encryption.key_bytes)
 
 
+@lru_cache(maxsize=1)
 def get_keycloak_service() -> KeycloakService:
-    """Dependency for getting the Keycloak service."""
+    """Dependency for getting the Keycloak service.
+
+    The instance holds the shared HTTP client; clear the cache when that
+    client is closed.
+    """
     settings = get_settings()
-    return KeycloakService(settings.keycloak)
+    return KeycloakService(settings.keycloak, get_http_client())
 
 
+@lru_cache(maxsize=1)
 def get_state_token_service() -> StateTokenService:
     """Dependency for getting the state token service."""
     settings = get_settings()
@@ -59,10 +88,20 @@ def get_token_vault_service(
     return TokenVaultService(repository, encryption)
 
 
+def get_read_token_vault_service(
+    session: "ReadSessionDep",
+    encryption: Annotated[EncryptionService, Depends(get_encryption_service)],
+) -> TokenVaultService:
+    """Dependency for getting a token vault service for lookups only."""
+    return TokenVaultService(TokenVaultRepository(session), encryption)
+
+
 # Annotated dependency types
 SessionDep = Annotated[AsyncSession, Depends(get_db)]
+ReadSessionDep = Annotated[AsyncSession, Depends(get_read_db)]
 EncryptionDep = Annotated[EncryptionService, Depends(get_encryption_service)]
 KeycloakDep = Annotated[KeycloakService, Depends(get_keycloak_service)]
 StateTokenDep = Annotated[StateTokenService, Depends(get_state_token_service)]
 TokenVaultRepoDep = Annotated[TokenVaultRepository, Depends(get_token_vault_repository)]
 TokenVaultServiceDep = Annotated[TokenVaultService, Depends(get_token_vault_service)]
+ReadTokenVaultServiceDep = Annotated[TokenVaultService, Depends(get_read_token_vault_service)]
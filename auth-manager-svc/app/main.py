@@ -1,33 +1,35 @@
 """FastAPI application entry point."""
 
 from contextlib import asynccontextmanager
+from functools import lru_cache
+from typing import Optional
 
-import httpx
+import orjson
 from fastapi import FastAPI, Request, status
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import ValidationError as PydanticValidationError
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from starlette.responses import Response
 
 from app.api import health
 from app.api.v1.auth_manager import router as auth_manager_router
-from app.config import get_settings
+from app.config import CORSSettings, get_settings
 from app.core.exceptions import AuthManagerError
-from app.core.logging import configure_logging, get_logger
+from app.core.http import http_client_manager
+from app.core.logging import configure_logging, get_logger, log_writer
 from app.db.base import db_manager
+from app.dependencies import get_keycloak_service
 from app.middleware import LoggingMiddleware, RequestIDMiddleware
-from app.models.api import ErrorResponse
 
 logger = get_logger(__name__)
 
-# Global HTTP client
-http_client: httpx.AsyncClient | None = None
-
 
 def make_logger():
     """Initialize logging configuration."""
     settings = get_settings()
     configure_logging(settings.log_level)
+    log_writer.start()
     logger.info("logger_initialized", log_level=settings.log_level)
 
 
@@ -39,23 +41,25 @@ def make_database():
         pool_size=settings.database.pool_size,
         max_overflow=settings.database.max_overflow,
         pool_timeout=settings.database.pool_timeout,
+        pool_recycle=settings.database.pool_recycle,
+        pool_pre_ping=settings.database.pool_pre_ping,
+        null_pool=settings.database.null_pool,
+        jit=settings.database.jit,
         echo=settings.database.echo,
+        prepared_statement_cache_size=settings.database.prepared_statement_cache_size,
     )
     logger.info("database_initialized")
 
 
-def make_http_client() -> httpx.AsyncClient:
-    """Initialize HTTP client."""
-    client = httpx.AsyncClient(timeout=30.0)
+def make_http_client():
+    """Initialize the shared HTTP client."""
+    http_client_manager.init()
     logger.info("http_client_initialized")
-    return client
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan manager."""
-    global http_client
-
     settings = get_settings()
 
     # Startup
@@ -63,7 +67,7 @@ async def lifespan(app: FastAPI):
     logger.info("startup", app=settings.app_name, version=settings.version)
 
     make_database()
-    http_client = make_http_client()
+    make_http_client()
 
     # Store database manager in app state
     app.state.database_session_manager = db_manager
@@ -73,9 +77,11 @@ async def lifespan(app: FastAPI):
     # Shutdown
     logger.info("shutdown_started")
     await db_manager.close()
-    if http_client:
-        await http_client.aclose()
+    await http_client_manager.close()
+    # The cached Keycloak service holds the client that was just closed
+    get_keycloak_service.cache_clear()
     logger.info("shutdown_complete")
+    log_writer.stop()
 
 
 # Create FastAPI application with metadata and lifespan
@@ -99,42 +105,32 @@ app = FastAPI(
 )
 
 
-# Middleware to attach database manager to request state
-@app.middleware("http")
-async def attach_db_manager(request: Request, call_next):
-    """Attach database manager to request state."""
-    request.state.database_session_manager = db_manager
-    response = await call_next(request)
-    return response
-
-
-# Register custom middleware (order matters: first added = outermost layer)
-# RequestIDMiddleware should be first to generate ID for logging
-app.add_middleware(RequestIDMiddleware)
+# Register custom middleware (order matters: last added = outermost layer)
+# RequestIDMiddleware wraps LoggingMiddleware so request logs carry the ID
 app.add_middleware(LoggingMiddleware)
+app.add_middleware(RequestIDMiddleware)
 
 
 # Configure CORS middleware
-# Note: CORS settings are loaded lazily when the application starts
 def configure_cors():
-    """Configure CORS middleware with settings from environment."""
-    settings = get_settings()
+    """Configure CORS middleware with settings from environment.
+
+    Middleware must be registered before the application starts serving, so
+    this runs at import. Only the CORS settings are loaded; every field has
+    a default, so importing the module needs no other environment, while a
+    malformed CORS value fails loudly instead of silently disabling CORS.
+    """
+    cors = CORSSettings()
     app.add_middleware(
         CORSMiddleware,
-        allow_origins=settings.cors.origins,
-        allow_credentials=settings.cors.allow_credentials,
+        allow_origins=cors.origins,
+        allow_credentials=cors.allow_credentials,
         allow_methods=["GET", "POST", "DELETE", "OPTIONS"],
         allow_headers=["*"],
     )
 
 
-# Configure CORS on startup
-try:
-    configure_cors()
-except Exception:
-    # CORS configuration will be attempted during lifespan startup
-    # This allows the module to be imported without environment variables
-    pass
+configure_cors()
 
 # Error code to HTTP status code mapping
 ERROR_STATUS_MAP = {
@@ -147,6 +143,16 @@ ERROR_STATUS_MAP = {
 }
 
 
+def _error_body(error: str, code: str, reason: Optional[str] = None) -> bytes:
+    """Serialize an error payload in the ErrorResponse shape with orjson."""
+    return orjson.dumps({"error": error, "code": code, "reason": reason})
+
+
+# Errors without details (missing header, inactive token, not found) repeat
+# the same few messages, so their bodies are serialized once and reused.
+_cached_error_body = lru_cache(maxsize=64)(_error_body)
+
+
 @app.exception_handler(AuthManagerError)
 async def auth_manager_error_handler(request: Request, exc: AuthManagerError) -> Response:
     """Handle custom AuthManagerError exceptions."""
@@ -157,12 +163,13 @@ async def auth_manager_error_handler(request: Request, exc: AuthManagerError) ->
 
     logger.error(exc.code, error=exc.message, path=str(request.url.path))
 
-    error_response = ErrorResponse(
-        error=exc.message, code=exc.code, reason=exc.details.get("reason")
-    )
+    if exc.details:
+        content = _error_body(exc.message, exc.code, exc.details.get("reason"))
+    else:
+        content = _cached_error_body(exc.message, exc.code)
 
     return Response(
-        content=error_response.model_dump_json(),
+        content=content,
         status_code=status_code,
         media_type="application/json",
     )
@@ -175,14 +182,8 @@ async def request_validation_error_handler(
     """Handle FastAPI request validation errors."""
     logger.error("validation_error", path=str(request.url.path), errors=exc.errors())
 
-    error_response = ErrorResponse(
-        error="Validation error",
-        code="validation_error",
-        reason=str(exc.errors()),
-    )
-
     return Response(
-        content=error_response.model_dump_json(),
+        content=_error_body("Validation error", "validation_error", str(exc.errors())),
         status_code=status.HTTP_400_BAD_REQUEST,
         media_type="application/json",
     )
@@ -195,15 +196,28 @@ async def pydantic_validation_error_handler(
     """Handle Pydantic validation errors."""
     logger.error("validation_error", path=str(request.url.path), errors=exc.errors())
 
-    error_response = ErrorResponse(
-        error="Validation error",
-        code="validation_error",
-        reason=str(exc.errors()),
+    return Response(
+        content=_error_body("Validation error", "validation_error", str(exc.errors())),
+        status_code=status.HTTP_400_BAD_REQUEST,
+        media_type="application/json",
     )
 
+
+# Served when every pooled connection stayed checked out for pool_timeout
+_POOL_EXHAUSTED_BODY = _error_body(
+    "Database connection pool exhausted", "database_unavailable", "Retry later"
+)
+
+
+@app.exception_handler(PoolTimeoutError)
+async def pool_timeout_error_handler(request: Request, exc: PoolTimeoutError) -> Response:
+    """Handle database pool checkout timeouts as a retryable overload."""
+    logger.error("database_pool_exhausted", path=str(request.url.path))
+
     return Response(
-        content=error_response.model_dump_json(),
-        status_code=status.HTTP_400_BAD_REQUEST,
+        content=_POOL_EXHAUSTED_BODY,
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        headers={"Retry-After": "1"},
         media_type="application/json",
     )
 
@@ -215,14 +229,8 @@ async def generic_exception_handler(request: Request, exc: Exception) -> Respons
         "unhandled_exception", error_type=type(exc).__name__, path=str(request.url.path)
     )
 
-    error_response = ErrorResponse(
-        error="Internal server error",
-        code="internal_error",
-        reason=str(exc),
-    )
-
     return Response(
-        content=error_response.model_dump_json(),
+        content=_error_body("Internal server error", "internal_error", str(exc)),
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         media_type="application/json",
     )
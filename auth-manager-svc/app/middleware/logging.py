@@ -2,24 +2,29 @@
 
 import time
 
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from app.core.logging import get_logger
 
 logger = get_logger(__name__)
 
 
-class LoggingMiddleware(BaseHTTPMiddleware):
+class LoggingMiddleware:
     """Middleware to log incoming requests and outgoing responses with structured logging.
 
+    Implemented as a plain ASGI middleware rather than ``BaseHTTPMiddleware``:
+    the status code is read from the ``http.response.start`` message as it is
+    sent, so responses stream through without a task group or body queue.
+
     Requirements:
         - 14.2: Log all incoming requests with method, path, and request_id
         - 14.3: Log all responses with status code and duration
     """
 
-    async def dispatch(self, request: Request, call_next):
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """
         Log request details and response status with timing information.
 
@@ -33,31 +38,42 @@ class LoggingMiddleware(BaseHTTPMiddleware):
 
         All logs are structured using structlog for easy parsing and analysis.
         """
-        # Record start time
-        start_time = time.time()
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.perf_counter()
+        method = scope["method"]
+        path = scope["path"]
+        client = scope.get("client")
+        query_string = scope.get("query_string", b"")
 
         # Log incoming request (request_id is automatically included from context)
         logger.info(
             "incoming_request",
-            method=request.method,
-            path=str(request.url.path),
-            client_host=request.client.host if request.client else None,
-            query_params=str(request.url.query) if request.url.query else None,
+            method=method,
+            path=path,
+            client_host=client[0] if client else None,
+            query_params=query_string.decode("latin-1") if query_string else None,
         )
 
-        # Process the request
-        response: Response = await call_next(request)
+        # An exception escaping the app is turned into a 500 further out
+        status_code = 500
 
-        # Calculate duration
-        duration_ms = (time.time() - start_time) * 1000
-
-        # Log response (request_id is automatically included from context)
-        logger.info(
-            "request_completed",
-            method=request.method,
-            path=str(request.url.path),
-            status_code=response.status_code,
-            duration_ms=round(duration_ms, 2),
-        )
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
 
-        return response
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # Log response (request_id is automatically included from context)
+            logger.info(
+                "request_completed",
+                method=method,
+                path=path,
+                status_code=status_code,
+                duration_ms=round((time.perf_counter() - start_time) * 1000, 2),
+            )
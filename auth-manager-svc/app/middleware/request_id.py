@@ -1,22 +1,29 @@
 """Request ID middleware for tracking requests."""
 
-import uuid
-
 import structlog
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-from starlette.responses import Response
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.ids import request_id as new_request_id
+
 
+class RequestIDMiddleware:
+    """Middleware to generate and attach unique request IDs to each request.
 
-class RequestIDMiddleware(BaseHTTPMiddleware):
-    """Middleware to generate and attach unique request IDs to each request."""
+    Implemented as a plain ASGI middleware rather than ``BaseHTTPMiddleware``:
+    the header is appended to the ``http.response.start`` message as it is
+    sent, so no task group or body queue is set up per request.
+    """
 
-    async def dispatch(self, request: Request, call_next):
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """
         Generate a unique request ID for each incoming request.
 
         The request ID is:
-        - Generated as a UUID4
+        - Generated as a UUID4 from a fast non-cryptographic source
         - Stored in request.state for access in route handlers
         - Bound to structlog context for automatic inclusion in all logs
         - Added to response headers as X-Request-ID
@@ -24,24 +31,26 @@ class RequestIDMiddleware(BaseHTTPMiddleware):
         Requirements:
             - 14.7: Include correlation IDs in logs for request tracing
         """
-        # Generate unique request ID
-        request_id = str(uuid.uuid4())
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-        # Store in request state for access in handlers and other middleware
-        request.state.request_id = request_id
-
-        # Bind request_id to structlog context so it appears in all logs
-        structlog.contextvars.clear_contextvars()
-        structlog.contextvars.bind_contextvars(request_id=request_id)
-
-        try:
-            # Process the request
-            response: Response = await call_next(request)
-
-            # Add request ID to response headers
-            response.headers["X-Request-ID"] = request_id
-
-            return response
-        finally:
-            # Clear context after request completes
-            structlog.contextvars.clear_contextvars()
+        # Generate unique request ID
+        request_id = new_request_id()
+
+        # Store in request state (backed by scope["state"]) for access in handlers
+        scope.setdefault("state", {})["request_id"] = request_id
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                # MutableHeaders copies the headers into a new list, so a tuple
+                # or the response's own raw_headers list is never appended to
+                message.setdefault("headers", [])
+                MutableHeaders(scope=message).append("X-Request-ID", request_id)
+            await send(message)
+
+        # Bind request_id to structlog context so it appears in all logs; the
+        # binding is reset when the block exits. Each request runs in its own
+        # copy of the context, so there is nothing to clear beforehand.
+        with structlog.contextvars.bound_contextvars(request_id=request_id):
+            await self.app(scope, receive, send_wrapper)
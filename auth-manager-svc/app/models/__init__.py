@@ -1,21 +1,22 @@
 """Pydantic models for request/response validation."""
 
+from app.models.api import ErrorResponse, SuccessResponse
 from app.models.domain import (
     KeycloakTokenResponse,
     TokenIntrospection,
+    TokenVaultCore,
     TokenVaultEntry,
 )
 from app.models.requests import (
     AccessTokenRequest,
     OfflineTokenRevokeRequest,
     StateTokenPayload,
+    ValidateTokensRequest,
 )
 from app.models.responses import (
     AccessTokenResponse,
-    ErrorResponse,
     OfflineConsentResponse,
     OfflineTokenResponse,
-    SuccessResponse,
     ValidationResponse,
 )
 
@@ -24,6 +25,7 @@ __all__ = [
     "AccessTokenRequest",
     "OfflineTokenRevokeRequest",
     "StateTokenPayload",
+    "ValidateTokensRequest",
     # Response models
     "AccessTokenResponse",
     "OfflineTokenResponse",
@@ -33,6 +35,7 @@ __all__ = [
     "SuccessResponse",
     # Domain models
     "TokenVaultEntry",
+    "TokenVaultCore",
     "KeycloakTokenResponse",
     "TokenIntrospection",
 ]
@@ -1,9 +1,12 @@
 """Domain models."""
 
+from dataclasses import dataclass
 from datetime import datetime
+from functools import cached_property
 from typing import Any, Dict, Optional
+from uuid import UUID
 
-from pydantic import UUID4, BaseModel
+from pydantic import UUID4, BaseModel, Field
 
 from app.db.models import TokenType
 
@@ -11,13 +14,13 @@ from app.db.models import TokenType
 class TokenVaultEntry(BaseModel):
     """Token vault entry domain model."""
 
-    id: UUID4
+    id: UUID
     user_id: UUID4
     token_type: TokenType
-    encrypted_token: Optional[str]
-    iv: Optional[str]
+    encrypted_token: str
+    iv: str
     token_hash: Optional[str]
-    metadata: Optional[Dict[str, Any]]
+    metadata: Optional[Dict[str, Any]] = Field(..., validation_alias="token_metadata")
     session_state_id: str
     created_at: datetime
     updated_at: Optional[datetime]
@@ -26,6 +29,21 @@ class TokenVaultEntry(BaseModel):
         from_attributes = True
 
 
+@dataclass(slots=True, frozen=True)
+class TokenVaultCore:
+    """Columns of a vault entry needed to decrypt and use its token.
+
+    A plain dataclass filled from a column projection, for lookups that do
+    not need the full TokenVaultEntry (metadata, timestamps, validation).
+    """
+
+    id: UUID
+    token_type: TokenType
+    session_state_id: str
+    encrypted_token: str
+    iv: str
+
+
 class KeycloakTokenResponse(BaseModel):
     """Keycloak token endpoint response model."""
 
@@ -50,3 +68,12 @@ class TokenIntrospection(BaseModel):
     client_id: Optional[str] = None
     username: Optional[str] = None
     scope: Optional[str] = None
+
+    @cached_property
+    def sub_uuid(self) -> Optional[UUID]:
+        """The ``sub`` claim parsed as a UUID.
+
+        Parsed on first access and kept on the instance, so cached
+        introspection results are only parsed once.
+        """
+        return UUID(self.sub) if self.sub is not None else None
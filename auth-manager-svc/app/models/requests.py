@@ -1,22 +1,39 @@
 """Pydantic request models."""
 
+from typing import List
+from uuid import UUID
+
 from pydantic import UUID4, BaseModel, Field
 
+# Upper bound on tokens accepted by the batch validation endpoint
+MAX_VALIDATE_TOKENS = 200
+
 
 class AccessTokenRequest(BaseModel):
     """Request model for access token endpoint."""
 
-    persistent_token_id: UUID4 = Field(..., alias="id", description="UUID of the persistent token")
+    persistent_token_id: UUID = Field(..., alias="id", description="UUID of the persistent token")
 
 
 class OfflineTokenRevokeRequest(BaseModel):
     """Request model for offline token revocation."""
 
-    id: UUID4 = Field(..., description="UUID of the token to revoke")
+    id: UUID = Field(..., description="UUID of the token to revoke")
+
+
+class ValidateTokensRequest(BaseModel):
+    """Request model for batch token validation."""
+
+    tokens: List[str] = Field(
+        ...,
+        min_length=1,
+        max_length=MAX_VALIDATE_TOKENS,
+        description="Access tokens to validate",
+    )
 
 
 class StateTokenPayload(BaseModel):
     """State token payload model."""
 
-    user_id: str
+    user_id: UUID4
     session_state_id: str
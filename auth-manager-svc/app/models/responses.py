@@ -1,8 +1,8 @@
 """Pydantic response models."""
 
-from typing import Any, Dict, Optional
+from uuid import UUID
 
-from pydantic import UUID4, BaseModel, Field
+from pydantic import BaseModel, Field
 
 
 class AccessTokenResponse(BaseModel):
@@ -15,7 +15,7 @@ class AccessTokenResponse(BaseModel):
 class OfflineTokenResponse(BaseModel):
     """Response model for offline token endpoints."""
 
-    persistent_token_id: UUID4 = Field(..., description="UUID identifier for the stored token")
+    persistent_token_id: UUID = Field(..., description="UUID identifier for the stored token")
     session_state_id: str = Field(..., description="Keycloak session state identifier")
 
 
@@ -40,18 +40,3 @@ class ValidationResponse(BaseModel):
     """Response model for token validation endpoint."""
 
     valid: bool = Field(default=True, description="Whether the token is valid and active")
-
-
-class ErrorResponse(BaseModel):
-    """Standard error response model."""
-
-    error: str = Field(..., description="Human-readable error message")
-    code: str = Field(..., description="Machine-readable error code")
-    details: Optional[Dict[str, Any]] = Field(default=None, description="Additional error details")
-    operation: Optional[str] = Field(default=None, description="The operation that failed")
-
-
-class SuccessResponse(BaseModel):
-    """Generic success response wrapper."""
-
-    data: Any = Field(..., description="Response data")
@@ -1,81 +1,92 @@
 """Token encryption and hashing service."""
 
 import hashlib
-import secrets
+import hmac
+import os
 
-from cryptography.hazmat.backends import default_backend
+from cryptography.exceptions import InvalidTag
 from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+# Tokens are written with AES-256-GCM under a 12-byte nonce. Entries stored
+# before the switch carry a 16-byte IV and are still read with AES-256-CBC.
+_GCM_NONCE_SIZE = 12
+_CBC_IV_SIZE = 16
+
+# PKCS7 padding blocks indexed by length: _PKCS7_PADS[n] is n bytes of value n
+_PKCS7_PADS = [bytes([n]) * n for n in range(17)]
 
 
 class EncryptionService:
     """Service for encrypting, decrypting, and hashing tokens."""
 
-    def __init__(self, encryption_key: str):
+    def __init__(self, encryption_key: str | bytes):
         """Initialize encryption service with encryption key.
 
         Args:
-            encryption_key: 64-character hex string (32 bytes)
+            encryption_key: 32 raw key bytes, or a 64-character hex string
 
         Raises:
-            ValueError: If encryption key is not 64 hex characters
+            ValueError: If encryption key is not 32 bytes or 64 hex characters
         """
-        if len(encryption_key) != 64:
-            raise ValueError("Encryption key must be 64 hex characters (32 bytes)")
-
-        try:
-            self.key = bytes.fromhex(encryption_key)
-        except ValueError as e:
-            raise ValueError(f"Encryption key must be valid hex string: {e}")
-
-    def generate_iv(self) -> str:
-        """Generate a random 16-byte IV and return as hex string.
-
-        Returns:
-            32-character hex string representing 16 bytes
-        """
-        return secrets.token_hex(16)
-
-    def encrypt_token(self, token: str, iv: str) -> str:
-        """Encrypt token using AES-256-CBC.
+        if isinstance(encryption_key, bytes):
+            if len(encryption_key) != 32:
+                raise ValueError("Encryption key must be 32 bytes")
+            self.key = encryption_key
+        else:
+            if len(encryption_key) != 64:
+                raise ValueError("Encryption key must be 64 hex characters (32 bytes)")
+
+            try:
+                self.key = bytes.fromhex(encryption_key)
+            except ValueError as e:
+                raise ValueError(f"Encryption key must be valid hex string: {e}")
+
+        # The key never changes, so the cipher objects are built once. AESGCM
+        # encrypts and authenticates in a single call; the CBC algorithm object
+        # is only needed to read legacy entries.
+        self._aesgcm = AESGCM(self.key)
+        self._aes = algorithms.AES(self.key)
+
+    def seal(self, token: str) -> tuple[str, str, str]:
+        """Encrypt token with AES-256-GCM under a fresh nonce and hash it for storage.
+
+        This is the only way to encrypt: the nonce is always generated here,
+        since reusing a GCM nonce under the same key breaks both confidentiality
+        and authenticity. The token is encoded once for both the cipher and the
+        hash. The GCM tag is not usable as ``token_hash``: it depends on the
+        nonce, so equal tokens would not compare equal. The hash algorithm must
+        stay stable, since stored hashes are compared for duplicate detection.
 
         Args:
             token: The token string to encrypt
-            iv: 32-character hex string (16 bytes)
 
         Returns:
-            Hex-encoded encrypted token
-
-        Raises:
-            ValueError: If IV is invalid
+            Tuple of (hex-encoded ciphertext and tag, 24-character hex nonce,
+            64-character hex SHA-256 hash of the token)
         """
-        try:
-            iv_bytes = bytes.fromhex(iv)
-        except ValueError as e:
-            raise ValueError(f"IV must be valid hex string: {e}")
-
-        if len(iv_bytes) != 16:
-            raise ValueError("IV must be 16 bytes (32 hex characters)")
-
-        cipher = Cipher(algorithms.AES(self.key), modes.CBC(iv_bytes), backend=default_backend())
-        encryptor = cipher.encryptor()
-
-        # Pad token to multiple of 16 bytes using PKCS7
-        padded_token = self._pad(token.encode())
-        encrypted = encryptor.update(padded_token) + encryptor.finalize()
-        return encrypted.hex()
+        data = token.encode()
+        nonce = os.urandom(_GCM_NONCE_SIZE)
+        return (
+            self._aesgcm.encrypt(nonce, data, None).hex(),
+            nonce.hex(),
+            hashlib.sha256(data).hexdigest(),
+        )
 
     def decrypt_token(self, encrypted_token: str, iv: str) -> str:
-        """Decrypt token using AES-256-CBC.
+        """Decrypt a token stored with AES-256-GCM, or with AES-256-CBC by older versions.
+
+        The mode is chosen by IV length: 12 bytes for GCM, 16 bytes for CBC.
 
         Args:
             encrypted_token: Hex-encoded encrypted token
-            iv: 32-character hex string (16 bytes)
+            iv: 24-character (GCM) or 32-character (CBC) hex string
 
         Returns:
             Decrypted token string
 
         Raises:
-            ValueError: If encrypted_token or IV is invalid
+            ValueError: If encrypted_token or IV is invalid, or authentication fails
         """
         try:
             iv_bytes = bytes.fromhex(iv)
@@ -83,42 +94,36 @@ class EncryptionService:
         except ValueError as e:
             raise ValueError(f"Encrypted token and IV must be valid hex strings: {e}")
 
-        if len(iv_bytes) != 16:
-            raise ValueError("IV must be 16 bytes (32 hex characters)")
+        if len(iv_bytes) == _GCM_NONCE_SIZE:
+            try:
+                return self._aesgcm.decrypt(iv_bytes, encrypted_bytes, None).decode()
+            except InvalidTag:
+                raise ValueError("Encrypted token failed authentication")
 
-        cipher = Cipher(algorithms.AES(self.key), modes.CBC(iv_bytes), backend=default_backend())
-        decryptor = cipher.decryptor()
+        if len(iv_bytes) != _CBC_IV_SIZE:
+            raise ValueError("IV must be 12 or 16 bytes (24 or 32 hex characters)")
 
-        decrypted = decryptor.update(encrypted_bytes) + decryptor.finalize()
-        return self._unpad(decrypted).decode()
+        return self._decrypt_cbc(encrypted_bytes, iv_bytes).decode()
 
-    def hash_token(self, token: str) -> str:
-        """Generate SHA-256 hash of token.
+    def _decrypt_cbc(self, ciphertext: bytes, iv_bytes: bytes) -> bytes:
+        """Decrypt raw AES-256-CBC bytes and remove the PKCS7 padding.
 
         Args:
-            token: The token string to hash
+            ciphertext: Encrypted bytes
+            iv_bytes: 16-byte IV
 
         Returns:
-            64-character hex string representing SHA-256 hash
-        """
-        return hashlib.sha256(token.encode()).hexdigest()
+            Decrypted bytes
 
-    @staticmethod
-    def _pad(data: bytes) -> bytes:
-        """Apply PKCS7 padding to data.
-
-        Args:
-            data: Bytes to pad
-
-        Returns:
-            Padded bytes (multiple of 16)
+        Raises:
+            ValueError: If the ciphertext is not block-aligned or the padding is invalid
         """
-        padding_length = 16 - (len(data) % 16)
-        return data + bytes([padding_length] * padding_length)
+        decryptor = Cipher(self._aes, modes.CBC(iv_bytes)).decryptor()
+        return self._unpad(decryptor.update(ciphertext) + decryptor.finalize())
 
     @staticmethod
     def _unpad(data: bytes) -> bytes:
-        """Remove PKCS7 padding from data.
+        """Remove PKCS7 padding from data decrypted in CBC mode.
 
         Args:
             data: Padded bytes
@@ -137,9 +142,8 @@ class EncryptionService:
         if padding_length > 16 or padding_length == 0:
             raise ValueError("Invalid padding length")
 
-        # Verify all padding bytes are correct
-        for i in range(padding_length):
-            if data[-(i + 1)] != padding_length:
-                raise ValueError("Invalid padding bytes")
+        # Verify all padding bytes at once, in constant time
+        if not hmac.compare_digest(data[-padding_length:], _PKCS7_PADS[padding_length]):
+            raise ValueError("Invalid padding bytes")
 
         return data[:-padding_length]
@@ -1,26 +1,125 @@
 """Keycloak OAuth/OIDC client service."""
 
+import asyncio
+import hashlib
+import time
+from typing import Optional
+from urllib.parse import quote_plus, urlencode
+
 import httpx
+import jwt
+import orjson
 
 from app.config import KeycloakSettings
+from app.core.cache import TTLCache
 from app.core.exceptions import KeycloakError
+from app.core.http import create_http_client
 from app.core.logging import get_logger
 from app.models.domain import KeycloakTokenResponse, TokenIntrospection
 
 logger = get_logger(__name__)
 
+# Active introspection results keyed by SHA-256 digest of the token.
+# Module level so the cache is shared by every KeycloakService instance.
+_introspection_cache: TTLCache[TokenIntrospection] = TTLCache(maxsize=10_000)
+
+# Tokens recently found inactive, so repeated requests with the same expired
+# or forged token are rejected without another verification or upstream call.
+_inactive_token_cache: TTLCache[bool] = TTLCache(maxsize=10_000)
+_INACTIVE = TokenIntrospection(active=False)
+
+# Token endpoint calls send pre-encoded form bodies with this content type
+_FORM_HEADERS = {"Content-Type": "application/x-www-form-urlencoded"}
+
+# Introspection calls currently in flight, so concurrent misses for the same
+# token share one upstream request.
+_introspection_inflight: dict[bytes, asyncio.Future[TokenIntrospection]] = {}
+
+
+# Realm signing keys keyed by ``kid``, shared by every KeycloakService instance.
+_jwks_cache: TTLCache[jwt.PyJWK] = TTLCache(maxsize=64)
+_jwks_refresh_lock = asyncio.Lock()
+_jwks_refreshed_at = 0.0
+
+# Minimum seconds between JWKS fetches, so tokens carrying unknown key ids
+# cannot make every request hit the certs endpoint.
+_JWKS_MIN_REFRESH_INTERVAL = 30.0
+
+# Signature algorithms that can be checked with the realm's public keys.
+# Keycloak signs refresh and offline tokens with an HMAC key, which is never
+# published, so those always go through remote introspection.
+_LOCAL_VERIFY_ALGORITHMS = frozenset(
+    {"RS256", "RS384", "RS512", "PS256", "PS384", "PS512", "ES256", "ES384", "ES512", "EdDSA"}
+)
+
+# Clock skew in seconds tolerated on exp/iat/nbf when verifying tokens locally
+_LOCAL_VERIFY_LEEWAY = 5
+
+# Seconds before expiry at which a cached admin token is replaced, so it is
+# never sent to Keycloak right as it lapses.
+_ADMIN_TOKEN_EXPIRY_MARGIN = 30.0
+
+
+def _token_cache_key(token: str) -> bytes:
+    return hashlib.sha256(token.encode()).digest()
+
 
 class KeycloakService:
     """Service for interacting with Keycloak OAuth/OIDC endpoints."""
 
-    def __init__(self, settings: KeycloakSettings):
+    def __init__(self, settings: KeycloakSettings, client: httpx.AsyncClient | None = None):
         """Initialize Keycloak service.
 
         Args:
             settings: Keycloak configuration settings
+            client: Shared HTTP client; a private one is created if omitted
         """
         self.settings = settings
-        self.client = httpx.AsyncClient(timeout=30.0)
+        self._owns_client = client is None
+        self.client = client if client is not None else create_http_client()
+
+        # Everything in the consent URL except the state parameter is constant
+        consent_params = {
+            "client_id": settings.client_id,
+            "redirect_uri": settings.redirect_uri,
+            "response_type": "code",
+            "scope": "openid offline_access",
+        }
+        self._consent_url_prefix = (
+            f"{settings.authorization_endpoint}?{urlencode(consent_params)}&state="
+        )
+
+        # Client credentials end every form body, so they are encoded once and
+        # each call only quotes its variable fields.
+        self._client_auth = (
+            "&"
+            + urlencode({"client_id": settings.client_id, "client_secret": settings.client_secret})
+        ).encode()
+        self._client_credentials_body = b"grant_type=client_credentials" + self._client_auth
+
+        self._sessions_url_prefix = f"{settings.admin_url}/realms/{settings.realm}/sessions/"
+
+        # Admin API token and its Authorization header, reused until shortly
+        # before the token expires
+        self._admin_token: Optional[str] = None
+        self._admin_headers: dict[str, str] = {}
+        self._admin_token_expires_at = 0.0
+        self._admin_token_lock = asyncio.Lock()
+
+    def build_consent_url(self, state: str) -> str:
+        """Build the authorization URL requesting offline_access consent.
+
+        Args:
+            state: State token to round-trip through the OAuth callback
+
+        Returns:
+            Keycloak authorization URL
+        """
+        return self._consent_url_prefix + quote_plus(state)
+
+    async def _post_form(self, url: str, body: bytes) -> httpx.Response:
+        """POST an already URL-encoded form body."""
+        return await self.client.post(url, content=body, headers=_FORM_HEADERS)
 
     async def refresh_access_token(self, refresh_token: str) -> KeycloakTokenResponse:
         """Refresh access token using refresh token.
@@ -34,16 +133,15 @@ class KeycloakService:
         Raises:
             KeycloakError: If token refresh fails
         """
-        data = {
-            "grant_type": "refresh_token",
-            "refresh_token": refresh_token,
-            "client_id": self.settings.client_id,
-            "client_secret": self.settings.client_secret,
-        }
+        body = (
+            b"grant_type=refresh_token&refresh_token="
+            + quote_plus(refresh_token).encode()
+            + self._client_auth
+        )
 
         logger.info("refresh_access_token", endpoint=self.settings.token_endpoint)
 
-        response = await self.client.post(self.settings.token_endpoint, data=data)
+        response = await self._post_form(self.settings.token_endpoint, body)
 
         if response.status_code != 200:
             logger.error(
@@ -57,7 +155,7 @@ class KeycloakService:
 
         logger.info("refresh_access_token_success", status_code=response.status_code)
 
-        return KeycloakTokenResponse(**response.json())
+        return KeycloakTokenResponse.model_validate_json(response.content)
 
     async def request_offline_token(self, refresh_token: str) -> KeycloakTokenResponse:
         """Request offline token with offline_access scope.
@@ -71,17 +169,15 @@ class KeycloakService:
         Raises:
             KeycloakError: If offline token request fails
         """
-        data = {
-            "grant_type": "refresh_token",
-            "refresh_token": refresh_token,
-            "client_id": self.settings.client_id,
-            "client_secret": self.settings.client_secret,
-            "scope": "offline_access",
-        }
+        body = (
+            b"grant_type=refresh_token&scope=offline_access&refresh_token="
+            + quote_plus(refresh_token).encode()
+            + self._client_auth
+        )
 
         logger.info("request_offline_token", endpoint=self.settings.token_endpoint)
 
-        response = await self.client.post(self.settings.token_endpoint, data=data)
+        response = await self._post_form(self.settings.token_endpoint, body)
 
         if response.status_code != 200:
             logger.error(
@@ -95,11 +191,20 @@ class KeycloakService:
 
         logger.info("request_offline_token_success", status_code=response.status_code)
 
-        return KeycloakTokenResponse(**response.json())
+        return KeycloakTokenResponse.model_validate_json(response.content)
 
     async def introspect_token(self, token: str) -> TokenIntrospection:
         """Introspect token to check if it's active.
 
+        Unless ``introspect_required`` is set, signed access tokens are first
+        verified locally (see ``verify_token_local``) and the introspection
+        endpoint is only called for tokens that cannot be checked that way.
+
+        Active results are cached until the token expires, bounded by
+        ``introspection_cache_ttl``. Inactive results are remembered for
+        ``negative_cache_ttl`` seconds.
+        Concurrent calls for the same uncached token share one request.
+
         Args:
             token: The token to introspect
 
@@ -109,15 +214,40 @@ class KeycloakService:
         Raises:
             KeycloakError: If token introspection fails
         """
-        data = {
-            "token": token,
-            "client_id": self.settings.client_id,
-            "client_secret": self.settings.client_secret,
-        }
+        cache_key = _token_cache_key(token)
+        cached = _introspection_cache.get(cache_key)
+        if cached is not None:
+            logger.debug("introspect_token_cache_hit")
+            return cached
+
+        if _inactive_token_cache.get(cache_key):
+            logger.debug("introspect_token_negative_cache_hit")
+            return _INACTIVE
+
+        if not self.settings.introspect_required:
+            token_info = await self.verify_token_local(token)
+            if token_info is not None:
+                self._cache_introspection(cache_key, token_info)
+                return token_info
+
+        inflight = _introspection_inflight.get(cache_key)
+        if inflight is None:
+            inflight = asyncio.ensure_future(self._fetch_introspection(token, cache_key))
+            _introspection_inflight[cache_key] = inflight
+            inflight.add_done_callback(lambda _: _introspection_inflight.pop(cache_key, None))
+        else:
+            logger.debug("introspect_token_coalesced")
+
+        # Shield so one cancelled caller does not cancel the request for the others
+        return await asyncio.shield(inflight)
+
+    async def _fetch_introspection(self, token: str, cache_key: bytes) -> TokenIntrospection:
+        """Call the introspection endpoint and cache an active result."""
+        body = b"token=" + quote_plus(token).encode() + self._client_auth
 
         logger.info("introspect_token", endpoint=self.settings.introspection_endpoint)
 
-        response = await self.client.post(self.settings.introspection_endpoint, data=data)
+        response = await self._post_form(self.settings.introspection_endpoint, body)
 
         if response.status_code != 200:
             logger.error(
@@ -131,7 +261,129 @@ class KeycloakService:
 
         logger.info("introspect_token_success", status_code=response.status_code)
 
-        return TokenIntrospection(**response.json())
+        token_info = TokenIntrospection.model_validate_json(response.content)
+        self._cache_introspection(cache_key, token_info)
+        return token_info
+
+    def _cache_introspection(self, cache_key: bytes, token_info: TokenIntrospection) -> None:
+        """Cache an active result until the token expires, bounded by the cache TTL.
+
+        Inactive results go to the negative cache for ``negative_cache_ttl``.
+        """
+        if not token_info.active:
+            _inactive_token_cache.set(cache_key, True, self.settings.negative_cache_ttl)
+            return
+
+        ttl = self.settings.introspection_cache_ttl
+        if token_info.exp is not None:
+            ttl = min(ttl, token_info.exp - time.time())
+        _introspection_cache.set(cache_key, token_info, ttl)
+
+    async def verify_token_local(self, token: str) -> Optional[TokenIntrospection]:
+        """Verify a signed access token against the realm's public keys.
+
+        Checks signature, issuer, expiry and that the token is a Bearer access
+        token (not e.g. an ID token) without calling Keycloak, apart from
+        fetching the JWKS when the signing key is not cached yet. Local
+        verification cannot see revocation: the token of a logged-out session
+        stays valid until it expires.
+
+        Args:
+            token: The token to verify
+
+        Returns:
+            TokenIntrospection built from the token claims, an inactive result
+            if the token is definitively invalid (expired, bad signature or not
+            a Bearer token), or None if the token must be introspected remotely,
+            including when a check fails for a possibly transient reason such
+            as clock skew
+        """
+        try:
+            header = jwt.get_unverified_header(token)
+        except jwt.InvalidTokenError:
+            return None
+
+        if header.get("alg") not in _LOCAL_VERIFY_ALGORITHMS:
+            return None
+
+        signing_key = await self._get_signing_key(header.get("kid"))
+        if signing_key is None:
+            return None
+
+        try:
+            claims = jwt.decode(
+                token,
+                signing_key,
+                algorithms=[signing_key.algorithm_name],
+                issuer=self.settings.issuer,
+                leeway=_LOCAL_VERIFY_LEEWAY,
+                options={"verify_aud": False, "require": ["exp"]},
+            )
+        except (jwt.ExpiredSignatureError, jwt.InvalidSignatureError) as e:
+            logger.info("verify_token_local_rejected", reason=str(e))
+            return TokenIntrospection(active=False)
+        except jwt.InvalidTokenError as e:
+            # Not definitive (e.g. iat/nbf skew beyond the leeway), so let
+            # Keycloak decide rather than negative-caching a valid token
+            logger.info("verify_token_local_inconclusive", reason=str(e))
+            return None
+
+        # ID and other realm-signed tokens share the issuer and keys
+        if claims.get("typ") != "Bearer":
+            logger.info("verify_token_local_rejected", reason="not a bearer token")
+            return TokenIntrospection(active=False)
+
+        logger.debug("verify_token_local_success")
+
+        # Same field mapping as Keycloak's introspection response
+        return TokenIntrospection(
+            active=True,
+            sub=claims.get("sub"),
+            session_state=claims.get("session_state") or claims.get("sid"),
+            exp=claims.get("exp"),
+            iat=claims.get("iat"),
+            client_id=claims.get("azp"),
+            username=claims.get("preferred_username"),
+            scope=claims.get("scope"),
+        )
+
+    async def _get_signing_key(self, kid: Optional[str]) -> Optional[jwt.PyJWK]:
+        """Return the realm signing key for ``kid``, reloading the JWKS on a miss."""
+        if kid is None:
+            return None
+
+        signing_key = _jwks_cache.get(kid)
+        if signing_key is None:
+            await self._refresh_jwks()
+            signing_key = _jwks_cache.get(kid)
+        return signing_key
+
+    async def _refresh_jwks(self) -> None:
+        """Reload the realm signing keys, at most once per refresh interval."""
+        global _jwks_refreshed_at
+
+        async with _jwks_refresh_lock:
+            if time.monotonic() - _jwks_refreshed_at < _JWKS_MIN_REFRESH_INTERVAL:
+                return
+            _jwks_refreshed_at = time.monotonic()
+
+            jwks_uri = self.settings.resolved_jwks_uri
+            logger.info("fetch_jwks", endpoint=jwks_uri)
+
+            try:
+                response = await self.client.get(jwks_uri)
+                response.raise_for_status()
+                jwk_set = jwt.PyJWKSet.from_dict(orjson.loads(response.content))
+            except (httpx.HTTPError, ValueError, jwt.PyJWKSetError) as e:
+                # Callers fall back to remote introspection
+                logger.warning("fetch_jwks_failed", error=str(e))
+                return
+
+            for key in jwk_set.keys:
+                if key.key_id is not None:
+                    _jwks_cache.set(key.key_id, key, self.settings.jwks_cache_ttl)
+
+            logger.info("fetch_jwks_success", keys=len(jwk_set.keys))
 
     async def revoke_token(self, token: str, token_type_hint: str = "refresh_token") -> None:
         """Revoke a token.
@@ -143,12 +395,13 @@ class KeycloakService:
         Raises:
             KeycloakError: If token revocation fails
         """
-        data = {
-            "token": token,
-            "token_type_hint": token_type_hint,
-            "client_id": self.settings.client_id,
-            "client_secret": self.settings.client_secret,
-        }
+        body = (
+            b"token="
+            + quote_plus(token).encode()
+            + b"&token_type_hint="
+            + quote_plus(token_type_hint).encode()
+            + self._client_auth
+        )
 
         logger.info(
             "revoke_token",
@@ -156,7 +409,7 @@ class KeycloakService:
             token_type_hint=token_type_hint,
         )
 
-        response = await self.client.post(self.settings.revocation_endpoint, data=data)
+        response = await self._post_form(self.settings.revocation_endpoint, body)
 
         if response.status_code not in [200, 204]:
             logger.error(
@@ -168,6 +421,9 @@ class KeycloakService:
                 f"Token revocation failed: {response.text}", status_code=response.status_code
             )
 
+        # A revoked token must not keep validating from the introspection cache
+        _introspection_cache.pop(_token_cache_key(token))
+
         logger.info("revoke_token_success", status_code=response.status_code)
 
     async def revoke_session(self, session_id: str) -> None:
@@ -179,14 +435,17 @@ class KeycloakService:
         Raises:
             KeycloakError: If session revocation fails
         """
-        admin_token = await self._get_admin_token()
-
-        url = f"{self.settings.admin_url}/realms/{self.settings.realm}/sessions/{session_id}"
-        headers = {"Authorization": f"Bearer {admin_token}"}
+        url = self._sessions_url_prefix + session_id
 
         logger.info("revoke_session", endpoint=url, session_id=session_id)
 
-        response = await self.client.delete(url, headers=headers)
+        response = await self.client.delete(url, headers=await self._get_admin_headers())
+
+        if response.status_code == 401:
+            # The cached admin token was rejected before its expiry (e.g. the
+            # client's sessions were revoked); fetch a new one and retry once.
+            self._admin_token = None
+            response = await self.client.delete(url, headers=await self._get_admin_headers())
 
         if response.status_code not in [200, 204]:
             logger.error(
@@ -213,17 +472,17 @@ class KeycloakService:
         Raises:
             KeycloakError: If code exchange fails
         """
-        data = {
-            "grant_type": "authorization_code",
-            "code": code,
-            "redirect_uri": redirect_uri,
-            "client_id": self.settings.client_id,
-            "client_secret": self.settings.client_secret,
-        }
+        body = (
+            b"grant_type=authorization_code&code="
+            + quote_plus(code).encode()
+            + b"&redirect_uri="
+            + quote_plus(redirect_uri).encode()
+            + self._client_auth
+        )
 
         logger.info("exchange_code_for_token", endpoint=self.settings.token_endpoint)
 
-        response = await self.client.post(self.settings.token_endpoint, data=data)
+        response = await self._post_form(self.settings.token_endpoint, body)
 
         if response.status_code != 200:
             logger.error(
@@ -237,31 +496,59 @@ class KeycloakService:
 
         logger.info("exchange_code_for_token_success", status_code=response.status_code)
 
-        return KeycloakTokenResponse(**response.json())
+        return KeycloakTokenResponse.model_validate_json(response.content)
 
     async def _get_admin_token(self) -> str:
         """Get admin access token for admin API calls.
 
+        The client_credentials token is cached until shortly before it
+        expires; concurrent callers wait for a single refresh.
+
         Returns:
             Admin access token string
 
         Raises:
             KeycloakError: If admin token request fails
         """
-        data = {
-            "grant_type": "client_credentials",
-            "client_id": self.settings.client_id,
-            "client_secret": self.settings.client_secret,
-        }
+        if self._admin_token and time.monotonic() < self._admin_token_expires_at:
+            return self._admin_token
 
-        response = await self.client.post(self.settings.token_endpoint, data=data)
-        if response.status_code != 200:
-            raise KeycloakError(
-                f"Admin token request failed: {response.text}", status_code=response.status_code
+        async with self._admin_token_lock:
+            # Another caller may have refreshed the token while we waited
+            if self._admin_token and time.monotonic() < self._admin_token_expires_at:
+                return self._admin_token
+
+            requested_at = time.monotonic()
+            response = await self._post_form(
+                self.settings.token_endpoint, self._client_credentials_body
+            )
+            if response.status_code != 200:
+                raise KeycloakError(
+                    f"Admin token request failed: {response.text}",
+                    status_code=response.status_code,
+                )
+
+            token_response = orjson.loads(response.content)
+            self._admin_token = token_response["access_token"]
+            self._admin_headers = {"Authorization": "Bearer " + self._admin_token}
+            self._admin_token_expires_at = (
+                requested_at + token_response.get("expires_in", 0) - _ADMIN_TOKEN_EXPIRY_MARGIN
             )
+            return self._admin_token
 
-        return response.json()["access_token"]
+    async def _get_admin_headers(self) -> dict[str, str]:
+        """Get the Authorization header for admin API calls, built once per admin token.
+
+        Raises:
+            KeycloakError: If admin token request fails
+        """
+        await self._get_admin_token()
+        return self._admin_headers
 
     async def close(self) -> None:
-        """Close HTTP client and cleanup resources."""
-        await self.client.aclose()
+        """Close HTTP client and cleanup resources.
+
+        A shared client passed in by the caller is left open.
+        """
+        if self._owns_client:
+            await self.client.aclose()
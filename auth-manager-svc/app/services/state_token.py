@@ -1,13 +1,33 @@
 """State token generation and parsing service."""
 
-from datetime import datetime, timedelta, timezone
+import base64
+import binascii
+import hashlib
+import hmac
+import time
 
-import jwt
+import orjson
+from pydantic import ValidationError
 
 from app.core.exceptions import InvalidStateTokenError
 from app.models.requests import StateTokenPayload
 
 
+def _b64url(data: bytes) -> bytes:
+    """Base64url-encode without padding, as JWS segments are."""
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+
+def _b64url_decode(segment: bytes) -> bytes:
+    """Decode an unpadded base64url segment, rejecting characters outside the alphabet."""
+    return base64.b64decode(segment + b"=" * (-len(segment) % 4), altchars=b"-_", validate=True)
+
+
+# The header is the same for every state token, so it is encoded once;
+# sorted keys match what PyJWT produces.
+_HS256_HEADER = _b64url(orjson.dumps({"alg": "HS256", "typ": "JWT"}))
+
+
 class StateTokenService:
     """Service for generating and parsing JWT state tokens."""
 
@@ -18,6 +38,7 @@ class StateTokenService:
             secret_key: Secret key for signing JWT tokens
         """
         self.secret_key = secret_key
+        self._secret_bytes = secret_key.encode()
 
     def generate_state_token(
         self,
@@ -27,6 +48,10 @@ class StateTokenService:
     ) -> str:
         """Generate JWT state token.
 
+        The compact HS256 token is assembled directly: orjson encodes the
+        claims, the constant header is reused, and the signature is a single
+        stdlib HMAC call. The result is a standard JWS that PyJWT can decode.
+
         Args:
             user_id: User identifier
             session_state_id: Keycloak session state identifier
@@ -35,19 +60,27 @@ class StateTokenService:
         Returns:
             JWT token string
         """
-        now = datetime.now(timezone.utc)
+        # JWT times are integer epoch seconds
+        now = int(time.time())
         payload = {
             "user_id": user_id,
             "session_state_id": session_state_id,
-            "exp": now + timedelta(seconds=expires_in),
+            "exp": now + expires_in,
             "iat": now,
         }
 
-        return jwt.encode(payload, self.secret_key, algorithm="HS256")
+        signing_input = _HS256_HEADER + b"." + _b64url(orjson.dumps(payload))
+        signature = hmac.new(self._secret_bytes, signing_input, hashlib.sha256).digest()
+        return (signing_input + b"." + _b64url(signature)).decode()
 
     def parse_state_token(self, token: str) -> StateTokenPayload:
         """Parse and validate state token.
 
+        Only tokens issued by generate_state_token are accepted, so the header
+        must be the exact HS256 header it writes; any other algorithm,
+        including ``none``, is rejected. The signature is compared in constant
+        time before the payload is decoded.
+
         Args:
             token: JWT token string to parse
 
@@ -57,14 +90,36 @@ class StateTokenService:
         Raises:
             InvalidStateTokenError: If token is expired or invalid
         """
+        segments = token.encode().split(b".")
+        if len(segments) != 3:
+            raise InvalidStateTokenError("Invalid state token: Not enough segments")
+
+        header, claims, signature = segments
+        if header != _HS256_HEADER:
+            raise InvalidStateTokenError("Invalid state token: Unsupported header")
+
+        expected = hmac.new(self._secret_bytes, header + b"." + claims, hashlib.sha256).digest()
+        if not hmac.compare_digest(signature, _b64url(expected)):
+            raise InvalidStateTokenError("Invalid state token: Signature verification failed")
+
+        try:
+            payload = orjson.loads(_b64url_decode(claims))
+        except (binascii.Error, ValueError) as e:
+            raise InvalidStateTokenError(f"Invalid state token: {str(e)}")
+        if not isinstance(payload, dict):
+            raise InvalidStateTokenError("Invalid state token: Payload is not an object")
+
+        exp = payload.get("exp")
+        if not isinstance(exp, int) or isinstance(exp, bool):
+            raise InvalidStateTokenError("Invalid state token: Missing or invalid exp claim")
+        if exp <= time.time():
+            raise InvalidStateTokenError("State token has expired")
+
         try:
-            payload = jwt.decode(token, self.secret_key, algorithms=["HS256"])
             return StateTokenPayload(
                 user_id=payload["user_id"], session_state_id=payload["session_state_id"]
             )
-        except jwt.ExpiredSignatureError:
-            raise InvalidStateTokenError("State token has expired")
-        except jwt.InvalidTokenError as e:
-            raise InvalidStateTokenError(f"Invalid state token: {str(e)}")
         except KeyError as e:
             raise InvalidStateTokenError(f"Missing required field in state token: {str(e)}")
+        except ValidationError as e:
+            raise InvalidStateTokenError(f"Invalid state token payload: {str(e)}")
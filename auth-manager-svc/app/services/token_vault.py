@@ -1,18 +1,46 @@
 """Token vault service for managing encrypted token storage."""
 
+import logging
 import time
 from typing import Optional
 from uuid import UUID
 
+from app.core.cache import TTLCache
 from app.core.exceptions import TokenNotFoundError
 from app.core.logging import get_logger
 from app.db.models import TokenType
 from app.db.repositories.token_vault import TokenVaultRepository
-from app.models.domain import TokenVaultEntry
+from app.models.domain import TokenVaultCore, TokenVaultEntry
 from app.services.encryption import EncryptionService
 
 logger = get_logger(__name__)
 
+# Decrypted offline tokens by persistent token ID, so repeated lookups of the
+# same token within the TTL skip both the database read and the decryption.
+# This is plaintext token material kept in process memory for up to the TTL.
+# Refresh tokens are never cached: they are replaced in place on every rotation,
+# and a cached copy could outlive the rotation on this or any other replica.
+# Offline tokens are only ever inserted or deleted; a delete is seen by other
+# replicas once their entry expires.
+_decrypted_token_cache: TTLCache[tuple[TokenVaultCore, str]] = TTLCache(maxsize=10_000, ttl=30.0)
+
+# Bumped on every invalidation. Reads only cache what they decrypted if no
+# invalidation happened while they were waiting on the database, so a read
+# that saw a row before it was deleted cannot put it back in the cache.
+_cache_generation = 0
+
+
+def _invalidate_cached_token(token_id: UUID) -> None:
+    """Drop a cached token and stop in-flight reads from caching it again."""
+    global _cache_generation
+    _cache_generation += 1
+    _decrypted_token_cache.pop(token_id)
+
+
+def _info_enabled() -> bool:
+    """Whether operation logs are emitted, so timing can be skipped otherwise."""
+    return logger.is_enabled_for(logging.INFO)
+
 
 class TokenVaultService:
     """Service for managing encrypted token storage and retrieval."""
@@ -47,17 +75,17 @@ class TokenVaultService:
         Returns:
             TokenVaultEntry with stored token information
         """
-        start_time = time.time()
-        logger.info(
-            "db_operation",
-            operation="store_token",
-            user_id=str(user_id),
-            token_type=token_type.value,
-        )
-
-        iv = self.encryption.generate_iv()
-        encrypted_token = self.encryption.encrypt_token(token, iv)
-        token_hash = self.encryption.hash_token(token)
+        info = _info_enabled()
+        if info:
+            start_time = time.perf_counter()
+            logger.info(
+                "db_operation",
+                operation="store_token",
+                user_id=user_id,
+                token_type=token_type.value,
+            )
+
+        encrypted_token, iv, token_hash = self.encryption.seal(token)
 
         result = await self.repository.create(
             user_id=user_id,
@@ -69,49 +97,55 @@ class TokenVaultService:
             metadata=metadata,
         )
 
-        duration_ms = (time.time() - start_time) * 1000
-        logger.info(
-            "db_operation_complete",
-            operation="store_token",
-            token_id=str(result.id),
-            duration_ms=round(duration_ms, 2),
-        )
+        if info:
+            logger.info(
+                "db_operation_complete",
+                operation="store_token",
+                token_id=result.id,
+                duration_ms=round((time.perf_counter() - start_time) * 1000, 2),
+            )
 
         return result
 
-    async def retrieve_and_decrypt(self, token_id: UUID) -> tuple[TokenVaultEntry, str]:
+    async def retrieve_and_decrypt(self, token_id: UUID) -> tuple[TokenVaultCore, str]:
         """Retrieve and decrypt a token.
 
         Args:
             token_id: Persistent token ID (UUID)
 
         Returns:
-            Tuple of (TokenVaultEntry, decrypted_token_string)
+            Tuple of (TokenVaultCore, decrypted_token_string)
 
         Raises:
-            TokenNotFoundError: If token not found or has no encrypted data
+            TokenNotFoundError: If token not found
         """
-        start_time = time.time()
-        logger.info("db_operation", operation="retrieve_and_decrypt", token_id=str(token_id))
-
-        entry = await self.repository.get_by_id(token_id)
-        if not entry:
-            logger.warning("token_not_found", token_id=str(token_id))
+        cached = _decrypted_token_cache.get(token_id)
+        if cached is not None:
+            return cached
+
+        info = _info_enabled()
+        if info:
+            start_time = time.perf_counter()
+            logger.info("db_operation", operation="retrieve_and_decrypt", token_id=token_id)
+
+        generation = _cache_generation
+        entry = await self.repository.get_core_by_id(token_id)
+        if entry is None:
+            logger.warning("token_not_found", token_id=token_id)
             raise TokenNotFoundError(f"Token {token_id} not found")
 
-        if not entry.encrypted_token or not entry.iv:
-            logger.error("token_missing_data", token_id=str(token_id))
-            raise TokenNotFoundError(f"Token {token_id} has no encrypted data")
-
         decrypted_token = self.encryption.decrypt_token(entry.encrypted_token, entry.iv)
 
-        duration_ms = (time.time() - start_time) * 1000
-        logger.info(
-            "db_operation_complete",
-            operation="retrieve_and_decrypt",
-            token_id=str(token_id),
-            duration_ms=round(duration_ms, 2),
-        )
+        if info:
+            logger.info(
+                "db_operation_complete",
+                operation="retrieve_and_decrypt",
+                token_id=token_id,
+                duration_ms=round((time.perf_counter() - start_time) * 1000, 2),
+            )
+
+        if entry.token_type == TokenType.OFFLINE and generation == _cache_generation:
+            _decrypted_token_cache.set(token_id, (entry, decrypted_token))
 
         return entry, decrypted_token
 
@@ -129,9 +163,7 @@ class TokenVaultService:
         Returns:
             Persistent token ID (UUID as string)
         """
-        iv = self.encryption.generate_iv()
-        encrypted_token = self.encryption.encrypt_token(token, iv)
-        token_hash = self.encryption.hash_token(token)
+        encrypted_token, iv, token_hash = self.encryption.seal(token)
 
         return await self.repository.upsert_refresh_token(
             user_id=user_id,
@@ -155,13 +187,21 @@ class TokenVaultService:
             Tuple of (TokenVaultEntry, decrypted_token_string) or None if not found
         """
         entry = await self.repository.get_by_session_state_id(session_state_id, token_type)
-        if not entry or not entry.encrypted_token or not entry.iv:
+        if entry is None:
             return None
 
         decrypted_token = self.encryption.decrypt_token(entry.encrypted_token, entry.iv)
 
         return entry, decrypted_token
 
+    async def lock_user_refresh_token(self, user_id: UUID) -> None:
+        """Serialize refresh token rotation for a user until the transaction ends.
+
+        Args:
+            user_id: User identifier
+        """
+        await self.repository.lock_user_refresh_token(user_id)
+
     async def get_by_user_id(
         self, user_id: UUID, token_type: Optional[TokenType] = None
     ) -> Optional[tuple[TokenVaultEntry, str]]:
@@ -175,7 +215,7 @@ class TokenVaultService:
             Tuple of (TokenVaultEntry, decrypted_token_string) or None if not found
         """
         entry = await self.repository.get_by_user_id(user_id, token_type)
-        if not entry or not entry.encrypted_token or not entry.iv:
+        if entry is None:
             return None
 
         decrypted_token = self.encryption.decrypt_token(entry.encrypted_token, entry.iv)
@@ -191,19 +231,25 @@ class TokenVaultService:
         Returns:
             True if token was deleted, False if not found
         """
-        start_time = time.time()
-        logger.info("db_operation", operation="delete_token", token_id=str(token_id))
-
+        info = _info_enabled()
+        if info:
+            start_time = time.perf_counter()
+            logger.info("db_operation", operation="delete_token", token_id=token_id)
+
+        # Before the DELETE so no new lookup is served from the cache, and once
+        # it commits for reads that still saw the row in the meantime
+        _invalidate_cached_token(token_id)
         result = await self.repository.delete_by_id(token_id)
+        self.repository.on_commit(lambda: _invalidate_cached_token(token_id))
 
-        duration_ms = (time.time() - start_time) * 1000
-        logger.info(
-            "db_operation_complete",
-            operation="delete_token",
-            token_id=str(token_id),
-            deleted=result,
-            duration_ms=round(duration_ms, 2),
-        )
+        if info:
+            logger.info(
+                "db_operation_complete",
+                operation="delete_token",
+                token_id=token_id,
+                deleted=result,
+                duration_ms=round((time.perf_counter() - start_time) * 1000, 2),
+            )
 
         return result
 
@@ -220,12 +266,4 @@ class TokenVaultService:
         Returns:
             Tuple of (has_duplicate_hash, has_shared_session)
         """
-        has_duplicate_hash = await self.repository.check_duplicate_token_hash(
-            token_hash, exclude_id
-        )
-
-        shared_sessions = await self.repository.get_all_by_session_state_id(
-            session_state_id, exclude_id=exclude_id
-        )
-
-        return has_duplicate_hash, len(shared_sessions) > 0
+        return await self.repository.check_shared_token(token_hash, session_state_id, exclude_id)
@@ -10,12 +10,14 @@ from fastapi.testclient import TestClient
 
 from app.main import app
 
+# One client for every test; the app and its routes are shared anyway
+client = TestClient(app)
+
 
 def test_health_endpoint():
     """Test the /health endpoint."""
     print("Testing /health endpoint...")
 
-    client = TestClient(app)
     response = client.get("/health")
 
     print(f"  Status Code: {response.status_code}")
@@ -38,7 +40,6 @@ def test_readiness_endpoint():
     """Test the /health/ready endpoint."""
     print("\nTesting /health/ready endpoint...")
 
-    client = TestClient(app)
     response = client.get("/health/ready")
 
     print(f"  Status Code: {response.status_code}")
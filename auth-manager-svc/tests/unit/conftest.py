@@ -0,0 +1,22 @@
+"""Fixtures shared by the unit tests."""
+
+import pytest
+
+from app.config import KeycloakSettings, get_settings
+from app.services import keycloak
+
+
+@pytest.fixture
+def keycloak_settings() -> KeycloakSettings:
+    """Keycloak settings loaded from the test environment."""
+    return get_settings().keycloak
+
+
+@pytest.fixture(autouse=True)
+def _reset_keycloak_state(monkeypatch):
+    """Give every test empty module-level introspection and JWKS caches."""
+    keycloak._introspection_cache.clear()
+    keycloak._inactive_token_cache.clear()
+    keycloak._introspection_inflight.clear()
+    keycloak._jwks_cache.clear()
+    monkeypatch.setattr(keycloak, "_jwks_refreshed_at", 0.0)
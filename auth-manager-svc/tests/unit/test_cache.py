@@ -0,0 +1,92 @@
+"""Tests for the in-process TTL cache."""
+
+import pytest
+
+from app.core import cache as cache_module
+from app.core.cache import TTLCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Drive time.monotonic from a settable value."""
+    now = {"t": 1000.0}
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: now["t"])
+    return now
+
+
+def test_get_returns_stored_value(clock):
+    cache: TTLCache[str] = TTLCache(maxsize=4, ttl=10)
+    cache.set("a", "value")
+
+    assert cache.get("a") == "value"
+    assert cache.get("missing") is None
+
+
+def test_entries_expire_after_ttl(clock):
+    cache: TTLCache[str] = TTLCache(maxsize=4, ttl=10)
+    cache.set("a", "value")
+
+    clock["t"] += 9.9
+    assert cache.get("a") == "value"
+
+    clock["t"] += 0.1
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_per_entry_ttl_overrides_default(clock):
+    cache: TTLCache[str] = TTLCache(maxsize=4, ttl=10)
+    cache.set("short", "value", ttl=1)
+    cache.set("long", "value")
+
+    clock["t"] += 2
+    assert cache.get("short") is None
+    assert cache.get("long") == "value"
+
+
+def test_non_positive_ttl_skips_caching(clock):
+    cache: TTLCache[str] = TTLCache(maxsize=4, ttl=10)
+    cache.set("zero", "value", ttl=0)
+    cache.set("negative", "value", ttl=-5)
+
+    assert len(cache) == 0
+
+
+def test_evicts_least_recently_used_at_maxsize(clock):
+    cache: TTLCache[int] = TTLCache(maxsize=2, ttl=10)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")  # "b" is now the least recently used
+
+    cache.set("c", 3)
+
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_overwriting_refreshes_recency_and_ttl(clock):
+    cache: TTLCache[int] = TTLCache(maxsize=2, ttl=10)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    clock["t"] += 5
+    cache.set("a", 10)
+
+    cache.set("c", 3)
+    clock["t"] += 6
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 10
+
+
+def test_pop_and_clear(clock):
+    cache: TTLCache[int] = TTLCache(maxsize=4, ttl=10)
+    cache.set("a", 1)
+    cache.set("b", 2)
+
+    assert cache.pop("a") == 1
+    assert cache.pop("a") is None
+
+    cache.clear()
+    assert cache.get("b") is None
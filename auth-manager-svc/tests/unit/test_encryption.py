@@ -0,0 +1,100 @@
+"""Tests for token encryption and decryption."""
+
+import hashlib
+
+import pytest
+
+from app.services.encryption import EncryptionService
+
+KEY = "00" * 32
+
+# AES-256-CBC with PKCS7 padding, as written by versions before the switch to GCM
+LEGACY_CBC_IV = "000102030405060708090a0b0c0d0e0f"
+LEGACY_CBC_TOKEN = "a875fb90028680f96a5e0afff5fa07df9cfd0b76abf22cb5dfff2248117a54fd"
+LEGACY_CBC_PLAINTEXT = "legacy-refresh-token"
+
+
+@pytest.fixture
+def encryption() -> EncryptionService:
+    return EncryptionService(KEY)
+
+
+def _flip_last_byte(hex_value: str) -> str:
+    data = bytearray(bytes.fromhex(hex_value))
+    data[-1] ^= 0x01
+    return data.hex()
+
+
+def test_seal_round_trips_with_gcm(encryption):
+    encrypted_token, iv, token_hash = encryption.seal("refresh-token")
+
+    assert len(iv) == 24
+    assert token_hash == hashlib.sha256(b"refresh-token").hexdigest()
+    assert encryption.decrypt_token(encrypted_token, iv) == "refresh-token"
+
+
+def test_seal_uses_fresh_nonce(encryption):
+    first = encryption.seal("refresh-token")
+    second = encryption.seal("refresh-token")
+
+    assert first[1] != second[1]
+    assert first[0] != second[0]
+    assert first[2] == second[2]
+
+
+def test_key_accepts_raw_bytes():
+    encryption = EncryptionService(bytes(32))
+
+    assert encryption.decrypt_token(*EncryptionService(KEY).seal("token")[:2]) == "token"
+
+
+@pytest.mark.parametrize("key", ["00" * 31, "zz" * 32, bytes(16)])
+def test_rejects_invalid_key(key):
+    with pytest.raises(ValueError):
+        EncryptionService(key)
+
+
+def test_decrypts_legacy_cbc_vector(encryption):
+    assert encryption.decrypt_token(LEGACY_CBC_TOKEN, LEGACY_CBC_IV) == LEGACY_CBC_PLAINTEXT
+
+
+def test_rejects_corrupted_legacy_cbc_padding(encryption):
+    with pytest.raises(ValueError):
+        encryption.decrypt_token(LEGACY_CBC_TOKEN[:-32], LEGACY_CBC_IV)
+
+
+def test_rejects_tampered_gcm_tag(encryption):
+    encrypted_token, iv, _ = encryption.seal("refresh-token")
+
+    with pytest.raises(ValueError, match="failed authentication"):
+        encryption.decrypt_token(_flip_last_byte(encrypted_token), iv)
+
+
+def test_rejects_tampered_gcm_nonce(encryption):
+    encrypted_token, iv, _ = encryption.seal("refresh-token")
+
+    with pytest.raises(ValueError, match="failed authentication"):
+        encryption.decrypt_token(encrypted_token, _flip_last_byte(iv))
+
+
+def test_rejects_gcm_ciphertext_under_other_key(encryption):
+    encrypted_token, iv, _ = EncryptionService("11" * 32).seal("refresh-token")
+
+    with pytest.raises(ValueError, match="failed authentication"):
+        encryption.decrypt_token(encrypted_token, iv)
+
+
+@pytest.mark.parametrize("iv", ["", "00" * 8, "00" * 13, "00" * 15, "00" * 17, "00" * 32])
+def test_rejects_bad_iv_length(encryption, iv):
+    encrypted_token, _, _ = encryption.seal("refresh-token")
+
+    with pytest.raises(ValueError, match="IV must be 12 or 16 bytes"):
+        encryption.decrypt_token(encrypted_token, iv)
+
+
+@pytest.mark.parametrize(
+    ("encrypted_token", "iv"), [("not-hex", "00" * 12), ("00" * 32, "not-hex")]
+)
+def test_rejects_non_hex_input(encryption, encrypted_token, iv):
+    with pytest.raises(ValueError, match="valid hex"):
+        encryption.decrypt_token(encrypted_token, iv)
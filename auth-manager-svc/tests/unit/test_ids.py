@@ -0,0 +1,88 @@
+"""Tests for identifier generation."""
+
+import time
+from uuid import UUID
+
+import pytest
+
+from app.core import ids
+from app.core.ids import request_id, uuid7
+
+
+def _timestamp_ms(value: UUID) -> int:
+    return value.int >> 80
+
+
+def _counter(value: UUID) -> int:
+    return (value.int >> 64) & 0xFFF
+
+
+@pytest.fixture
+def fixed_clock(monkeypatch):
+    """Freeze time.time_ns at a settable millisecond and reset the generator."""
+    clock = {"ms": 1_700_000_000_000}
+    monkeypatch.setattr(time, "time_ns", lambda: clock["ms"] * 1_000_000)
+    monkeypatch.setattr(ids, "_uuid7_last_ms", 0)
+    monkeypatch.setattr(ids, "_uuid7_counter", 0)
+    return clock
+
+
+def test_uuid7_version_and_variant():
+    value = uuid7()
+
+    assert value.version == 7
+    assert value.variant == "specified in RFC 4122"
+
+
+def test_uuid7_embeds_current_timestamp(fixed_clock):
+    assert _timestamp_ms(uuid7()) == fixed_clock["ms"]
+
+
+def test_uuid7_is_monotonic_within_a_millisecond(fixed_clock):
+    values = [uuid7() for _ in range(1000)]
+
+    assert values == sorted(values)
+    assert len(set(values)) == len(values)
+    assert {_timestamp_ms(v) for v in values} == {fixed_clock["ms"]}
+
+
+def test_uuid7_is_ordered_across_milliseconds(fixed_clock):
+    earlier = [uuid7() for _ in range(5)]
+    fixed_clock["ms"] += 1
+    later = [uuid7() for _ in range(5)]
+
+    assert max(earlier) < min(later)
+    assert _timestamp_ms(later[0]) == fixed_clock["ms"]
+
+
+def test_uuid7_counter_starts_with_headroom(fixed_clock):
+    for _ in range(50):
+        fixed_clock["ms"] += 1
+        assert _counter(uuid7()) < 0x800
+
+
+def test_uuid7_counter_overflow_advances_timestamp(fixed_clock, monkeypatch):
+    uuid7()
+    monkeypatch.setattr(ids, "_uuid7_counter", 0xFFF)
+
+    value = uuid7()
+
+    assert _timestamp_ms(value) == fixed_clock["ms"] + 1
+    assert _counter(value) == 0
+
+
+def test_uuid7_stays_ordered_when_clock_goes_backwards(fixed_clock):
+    before = uuid7()
+    fixed_clock["ms"] -= 1000
+
+    after = uuid7()
+
+    assert after > before
+    assert _timestamp_ms(after) == _timestamp_ms(before)
+
+
+def test_request_id_is_uuid4():
+    value = UUID(request_id())
+
+    assert value.version == 4
+    assert value.variant == "specified in RFC 4122"
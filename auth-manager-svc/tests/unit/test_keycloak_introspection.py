@@ -0,0 +1,139 @@
+"""Tests for introspection caching and request coalescing in KeycloakService."""
+
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from app.core.exceptions import KeycloakError
+from app.services import keycloak
+from app.services.keycloak import KeycloakService
+
+
+class FakeKeycloak:
+    """Mock transport handler for the introspection and revocation endpoints."""
+
+    def __init__(self, active: bool = True):
+        self.active = active
+        self.introspect_calls = 0
+        self.revoke_calls = 0
+        self.release = asyncio.Event()
+        self.release.set()
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/introspect"):
+            self.introspect_calls += 1
+            await self.release.wait()
+            body = {"active": self.active}
+            if self.active:
+                body.update(sub="user-1", exp=int(time.time()) + 300)
+            return httpx.Response(200, json=body)
+        if request.url.path.endswith("/revoke"):
+            self.revoke_calls += 1
+            return httpx.Response(200)
+        return httpx.Response(404)
+
+
+@pytest.fixture
+def fake_keycloak() -> FakeKeycloak:
+    return FakeKeycloak()
+
+
+@pytest.fixture
+def service(keycloak_settings, fake_keycloak) -> KeycloakService:
+    client = httpx.AsyncClient(transport=httpx.MockTransport(fake_keycloak))
+    return KeycloakService(keycloak_settings, client)
+
+
+async def test_active_result_is_cached(service, fake_keycloak):
+    first = await service.introspect_token("token")
+    second = await service.introspect_token("token")
+
+    assert first.active and second.active
+    assert second.sub == "user-1"
+    assert fake_keycloak.introspect_calls == 1
+
+
+async def test_concurrent_calls_share_one_request(service, fake_keycloak):
+    fake_keycloak.release.clear()
+    tasks = [asyncio.create_task(service.introspect_token("token")) for _ in range(10)]
+    await asyncio.sleep(0)
+
+    fake_keycloak.release.set()
+    results = await asyncio.gather(*tasks)
+
+    assert all(result.active for result in results)
+    assert fake_keycloak.introspect_calls == 1
+    assert not keycloak._introspection_inflight
+
+
+async def test_cancelled_waiter_does_not_cancel_shared_request(service, fake_keycloak):
+    fake_keycloak.release.clear()
+    cancelled = asyncio.create_task(service.introspect_token("token"))
+    waiting = asyncio.create_task(service.introspect_token("token"))
+    await asyncio.sleep(0)
+
+    cancelled.cancel()
+    await asyncio.sleep(0)
+    fake_keycloak.release.set()
+
+    assert (await waiting).active
+    assert cancelled.cancelled()
+    assert fake_keycloak.introspect_calls == 1
+
+
+async def test_failed_request_is_not_cached(keycloak_settings):
+    calls = 0
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal calls
+        calls += 1
+        return httpx.Response(503, text="unavailable")
+
+    service = KeycloakService(
+        keycloak_settings, httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    )
+
+    for _ in range(2):
+        with pytest.raises(KeycloakError):
+            await service.introspect_token("token")
+
+    assert calls == 2
+    assert not keycloak._introspection_inflight
+
+
+async def test_revoke_token_evicts_cached_result(service, fake_keycloak):
+    await service.introspect_token("token")
+
+    await service.revoke_token("token")
+    fake_keycloak.active = False
+    result = await service.introspect_token("token")
+
+    assert fake_keycloak.revoke_calls == 1
+    assert fake_keycloak.introspect_calls == 2
+    assert not result.active
+
+
+async def test_inactive_result_is_negative_cached(service, fake_keycloak):
+    fake_keycloak.active = False
+
+    first = await service.introspect_token("token")
+    second = await service.introspect_token("token")
+
+    assert not first.active and not second.active
+    assert fake_keycloak.introspect_calls == 1
+    assert keycloak._inactive_token_cache.get(keycloak._token_cache_key("token"))
+
+
+async def test_negative_cache_can_be_disabled(keycloak_settings, fake_keycloak):
+    settings = keycloak_settings.model_copy(update={"negative_cache_ttl": 0})
+    service = KeycloakService(
+        settings, httpx.AsyncClient(transport=httpx.MockTransport(fake_keycloak))
+    )
+    fake_keycloak.active = False
+
+    await service.introspect_token("token")
+    await service.introspect_token("token")
+
+    assert fake_keycloak.introspect_calls == 2
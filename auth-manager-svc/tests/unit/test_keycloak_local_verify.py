@@ -0,0 +1,180 @@
+"""Tests for local access token verification against the realm JWKS."""
+
+import asyncio
+import time
+
+import httpx
+import jwt
+import pytest
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+from app.services import keycloak
+from app.services.keycloak import KeycloakService
+
+KID = "realm-key-1"
+
+
+def _rsa_key() -> rsa.RSAPrivateKey:
+    return rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+
+REALM_KEY = _rsa_key()
+OTHER_KEY = _rsa_key()
+
+
+def _jwk(private_key: rsa.RSAPrivateKey, kid: str) -> dict:
+    jwk = jwt.algorithms.RSAAlgorithm.to_jwk(private_key.public_key(), as_dict=True)
+    return {**jwk, "kid": kid, "alg": "RS256", "use": "sig"}
+
+
+class FakeKeycloak:
+    """Mock transport handler serving the realm JWKS and introspection."""
+
+    def __init__(self):
+        self.keys = [_jwk(REALM_KEY, KID)]
+        self.jwks_calls = 0
+        self.introspect_calls = 0
+        self.release = asyncio.Event()
+        self.release.set()
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/certs"):
+            self.jwks_calls += 1
+            await self.release.wait()
+            return httpx.Response(200, json={"keys": self.keys})
+        if request.url.path.endswith("/introspect"):
+            self.introspect_calls += 1
+            return httpx.Response(200, json={"active": True, "sub": "remote-user"})
+        return httpx.Response(404)
+
+
+@pytest.fixture
+def fake_keycloak() -> FakeKeycloak:
+    return FakeKeycloak()
+
+
+@pytest.fixture
+def local_settings(keycloak_settings):
+    return keycloak_settings.model_copy(update={"introspect_required": False})
+
+
+@pytest.fixture
+def service(local_settings, fake_keycloak) -> KeycloakService:
+    client = httpx.AsyncClient(transport=httpx.MockTransport(fake_keycloak))
+    return KeycloakService(local_settings, client)
+
+
+@pytest.fixture
+def make_token(keycloak_settings):
+    def make(
+        key: rsa.RSAPrivateKey = REALM_KEY, kid: str = KID, expires_in: int = 300, **claims
+    ) -> str:
+        now = int(time.time())
+        payload = {
+            "iss": keycloak_settings.issuer,
+            "sub": "user-1",
+            "typ": "Bearer",
+            "azp": "test-client",
+            "sid": "session-1",
+            "iat": now,
+            "exp": now + expires_in,
+            **claims,
+        }
+        return jwt.encode(payload, key, algorithm="RS256", headers={"kid": kid})
+
+    return make
+
+
+async def test_valid_token_is_verified_locally(service, fake_keycloak, make_token):
+    result = await service.introspect_token(make_token())
+
+    assert result.active
+    assert result.sub == "user-1"
+    assert result.session_state == "session-1"
+    assert result.client_id == "test-client"
+    assert fake_keycloak.introspect_calls == 0
+    assert fake_keycloak.jwks_calls == 1
+
+
+async def test_bad_signature_is_inactive(service, make_token):
+    result = await service.verify_token_local(make_token(key=OTHER_KEY))
+
+    assert result is not None and not result.active
+
+
+async def test_expired_within_leeway_is_active(service, make_token):
+    result = await service.verify_token_local(
+        make_token(expires_in=-(keycloak._LOCAL_VERIFY_LEEWAY - 2))
+    )
+
+    assert result is not None and result.active
+
+
+async def test_expired_beyond_leeway_is_inactive(service, make_token):
+    result = await service.verify_token_local(
+        make_token(expires_in=-(keycloak._LOCAL_VERIFY_LEEWAY + 5))
+    )
+
+    assert result is not None and not result.active
+
+
+async def test_non_bearer_token_is_inactive(service, make_token):
+    result = await service.verify_token_local(make_token(typ="ID"))
+
+    assert result is not None and not result.active
+
+
+async def test_wrong_issuer_falls_back_to_introspection(service, fake_keycloak, make_token):
+    token = make_token(iss="http://elsewhere.test/realms/test")
+
+    assert await service.verify_token_local(token) is None
+    assert (await service.introspect_token(token)).sub == "remote-user"
+    assert fake_keycloak.introspect_calls == 1
+
+
+async def test_audience_is_not_checked(service, make_token):
+    # Keycloak's introspection does not check the audience either
+    result = await service.verify_token_local(make_token(aud="some-other-client"))
+
+    assert result is not None and result.active
+
+
+async def test_unknown_kid_triggers_single_refresh(service, fake_keycloak, make_token):
+    token = make_token(kid="unknown-kid")
+    fake_keycloak.release.clear()
+    tasks = [asyncio.create_task(service.verify_token_local(token)) for _ in range(5)]
+    await asyncio.sleep(0)
+
+    fake_keycloak.release.set()
+    results = await asyncio.gather(*tasks)
+    again = await service.verify_token_local(token)
+
+    assert results == [None] * 5
+    assert again is None
+    assert fake_keycloak.jwks_calls == 1
+
+
+async def test_rotated_key_is_picked_up_by_refresh(service, fake_keycloak, make_token):
+    assert (await service.verify_token_local(make_token())).active
+    fake_keycloak.keys.append(_jwk(OTHER_KEY, "realm-key-2"))
+    keycloak._jwks_refreshed_at = 0.0
+
+    result = await service.verify_token_local(make_token(key=OTHER_KEY, kid="realm-key-2"))
+
+    assert result is not None and result.active
+    assert fake_keycloak.jwks_calls == 2
+
+
+async def test_introspect_required_skips_local_verification(
+    keycloak_settings, fake_keycloak, make_token
+):
+    settings = keycloak_settings.model_copy(update={"introspect_required": True})
+    service = KeycloakService(
+        settings, httpx.AsyncClient(transport=httpx.MockTransport(fake_keycloak))
+    )
+
+    result = await service.introspect_token(make_token(key=OTHER_KEY))
+
+    assert result.sub == "remote-user"
+    assert fake_keycloak.introspect_calls == 1
+    assert fake_keycloak.jwks_calls == 0
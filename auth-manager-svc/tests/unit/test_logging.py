@@ -0,0 +1,105 @@
+"""Tests for the background log writer."""
+
+import io
+import threading
+
+import orjson
+import pytest
+
+from app.core import logging as logging_module
+from app.core.logging import LogWriter
+
+
+class BlockingStream(io.BytesIO):
+    """Stream whose writes wait until released, to back the queue up."""
+
+    def __init__(self):
+        super().__init__()
+        self.release = threading.Event()
+        self.entered = threading.Event()
+
+    def write(self, data: bytes) -> int:
+        self.entered.set()
+        self.release.wait(timeout=5)
+        return super().write(data)
+
+
+@pytest.fixture(autouse=True)
+def _no_atexit(monkeypatch):
+    registered = []
+    monkeypatch.setattr(logging_module.atexit, "register", registered.append)
+    return registered
+
+
+def _lines(stream: io.BytesIO) -> list[bytes]:
+    return stream.getvalue().splitlines()
+
+
+def test_writes_synchronously_before_start():
+    stream = io.BytesIO()
+    writer = LogWriter(stream)
+
+    writer.write(b"line\n")
+
+    assert _lines(stream) == [b"line"]
+
+
+def test_stop_drains_queue_in_order():
+    stream = BlockingStream()
+    writer = LogWriter(stream)
+    writer.start()
+
+    expected = [b"line-%d" % i for i in range(2000)]
+    for line in expected:
+        writer.write(line + b"\n")
+    stream.release.set()
+    writer.stop()
+
+    assert _lines(stream) == expected
+    assert writer.dropped == 0
+
+
+def test_writes_after_stop_are_synchronous():
+    stream = io.BytesIO()
+    writer = LogWriter(stream)
+    writer.start()
+    writer.stop()
+
+    writer.write(b"after\n")
+
+    assert _lines(stream) == [b"after"]
+
+
+def test_full_queue_drops_and_reports_lines():
+    stream = BlockingStream()
+    writer = LogWriter(stream, max_queued=4)
+    writer.start()
+
+    # The writer thread takes the first line and blocks writing it
+    writer.write(b"first\n")
+    assert stream.entered.wait(timeout=5)
+    for i in range(10):
+        writer.write(b"queued-%d\n" % i)
+    stream.release.set()
+    writer.stop()
+
+    lines = _lines(stream)
+    [report] = [orjson.loads(line) for line in lines if line.startswith(b"{")]
+    assert [line for line in lines if not line.startswith(b"{")] == [b"first"] + [
+        b"queued-%d" % i for i in range(4)
+    ]
+    assert writer.dropped == 6
+    assert report["event"] == "log_lines_dropped"
+    assert report["dropped"] == 6
+    assert report["level"] == "warning"
+
+
+def test_start_registers_atexit_flush_once(_no_atexit):
+    writer = LogWriter(io.BytesIO())
+
+    writer.start()
+    writer.stop()
+    writer.start()
+    writer.stop()
+
+    assert _no_atexit == [writer.stop]
@@ -0,0 +1,196 @@
+"""ASGI-level tests for the request ID and logging middlewares."""
+
+from uuid import UUID
+
+import pytest
+import structlog
+
+from app.middleware import logging as logging_middleware
+from app.middleware.logging import LoggingMiddleware
+from app.middleware.request_id import RequestIDMiddleware
+
+
+def _http_scope(**overrides) -> dict:
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": "/api/v1/health",
+        "query_string": b"",
+        "headers": [],
+        "client": ("10.0.0.1", 51234),
+    }
+    scope.update(overrides)
+    return scope
+
+
+async def _receive() -> dict:
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+def _app(status: int = 200, headers=None, seen: dict | None = None):
+    """ASGI app sending an empty response with the given start-message headers."""
+
+    async def app(scope, receive, send):
+        if seen is not None:
+            seen["state"] = dict(scope.get("state", {}))
+            seen["context"] = structlog.contextvars.get_contextvars()
+        start = {"type": "http.response.start", "status": status}
+        if headers is not None:
+            start["headers"] = headers
+        await send(start)
+        await send({"type": "http.response.body", "body": b""})
+
+    return app
+
+
+async def _run(middleware, scope: dict) -> list[dict]:
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    await middleware(scope, _receive, send)
+    return sent
+
+
+def _request_id_header(message: dict) -> str:
+    values = [value for key, value in message["headers"] if key == b"x-request-id"]
+    assert len(values) == 1
+    return values[0].decode()
+
+
+async def test_request_id_header_matches_request_state_and_log_context():
+    seen = {}
+    scope = _http_scope()
+
+    sent = await _run(RequestIDMiddleware(_app(headers=[], seen=seen)), scope)
+
+    request_id = _request_id_header(sent[0])
+    assert UUID(request_id).version == 4
+    assert seen["state"]["request_id"] == request_id
+    assert seen["context"]["request_id"] == request_id
+    assert "request_id" not in structlog.contextvars.get_contextvars()
+
+
+async def test_request_id_does_not_mutate_app_headers_list():
+    app_headers = [(b"content-type", b"application/json")]
+
+    sent = await _run(RequestIDMiddleware(_app(headers=app_headers)), _http_scope())
+
+    assert app_headers == [(b"content-type", b"application/json")]
+    assert (b"content-type", b"application/json") in sent[0]["headers"]
+    _request_id_header(sent[0])
+
+
+async def test_request_id_handles_tuple_headers():
+    app_headers = ((b"content-type", b"text/plain"),)
+
+    sent = await _run(RequestIDMiddleware(_app(headers=app_headers)), _http_scope())
+
+    assert app_headers == ((b"content-type", b"text/plain"),)
+    assert (b"content-type", b"text/plain") in sent[0]["headers"]
+    _request_id_header(sent[0])
+
+
+async def test_request_id_handles_missing_headers():
+    sent = await _run(RequestIDMiddleware(_app(headers=None)), _http_scope())
+
+    _request_id_header(sent[0])
+
+
+async def test_request_ids_differ_between_requests():
+    middleware = RequestIDMiddleware(_app(headers=[]))
+
+    first = await _run(middleware, _http_scope())
+    second = await _run(middleware, _http_scope())
+
+    assert _request_id_header(first[0]) != _request_id_header(second[0])
+
+
+async def test_request_id_passes_through_non_http_scopes():
+    received = []
+
+    async def app(scope, receive, send):
+        received.append(scope)
+
+    scope = {"type": "lifespan"}
+    await RequestIDMiddleware(app)(scope, _receive, None)
+
+    assert received == [scope]
+    assert "state" not in scope
+
+
+class RecordingLogger:
+    def __init__(self):
+        self.events: list[tuple[str, dict]] = []
+
+    def info(self, event: str, **fields) -> None:
+        self.events.append((event, fields))
+
+
+@pytest.fixture
+def recording_logger(monkeypatch) -> RecordingLogger:
+    recorder = RecordingLogger()
+    monkeypatch.setattr(logging_middleware, "logger", recorder)
+    return recorder
+
+
+async def test_logging_records_request_and_response(recording_logger):
+    scope = _http_scope(method="POST", path="/api/v1/things", query_string=b"a=1&b=2")
+
+    sent = await _run(LoggingMiddleware(_app(status=201, headers=[])), scope)
+
+    assert [message["type"] for message in sent] == [
+        "http.response.start",
+        "http.response.body",
+    ]
+    (incoming, incoming_fields), (completed, completed_fields) = recording_logger.events
+    assert incoming == "incoming_request"
+    assert incoming_fields == {
+        "method": "POST",
+        "path": "/api/v1/things",
+        "client_host": "10.0.0.1",
+        "query_params": "a=1&b=2",
+    }
+    assert completed == "request_completed"
+    assert completed_fields["status_code"] == 201
+    assert completed_fields["duration_ms"] >= 0
+
+
+async def test_logging_reports_500_when_app_raises(recording_logger):
+    async def app(scope, receive, send):
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        await _run(LoggingMiddleware(app), _http_scope(client=None))
+
+    incoming_fields = recording_logger.events[0][1]
+    completed, completed_fields = recording_logger.events[1]
+    assert incoming_fields["client_host"] is None
+    assert incoming_fields["query_params"] is None
+    assert completed == "request_completed"
+    assert completed_fields["status_code"] == 500
+
+
+async def test_logging_passes_through_non_http_scopes(recording_logger):
+    received = []
+
+    async def app(scope, receive, send):
+        received.append(scope["type"])
+
+    await LoggingMiddleware(app)({"type": "lifespan"}, _receive, None)
+
+    assert received == ["lifespan"]
+    assert recording_logger.events == []
+
+
+async def test_request_id_and_logging_stack(recording_logger):
+    middleware = RequestIDMiddleware(LoggingMiddleware(_app(headers=[])))
+
+    sent = await _run(middleware, _http_scope())
+
+    _request_id_header(sent[0])
+    assert [event for event, _ in recording_logger.events] == [
+        "incoming_request",
+        "request_completed",
+    ]
@@ -0,0 +1,91 @@
+"""Tests for refresh token rotation locking."""
+
+from types import SimpleNamespace
+from uuid import UUID, uuid4
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.api.v1.auth_manager.refresh_token_id import _rotate_refresh_token
+from app.core.exceptions import InvalidRequestError
+from app.db.repositories import token_vault as repository_module
+from app.db.repositories.token_vault import TokenVaultRepository
+
+USER_ID = UUID("0190b7e0-1c2d-7a3b-8c4d-5e6f7a8b9c0d")
+
+
+class FakeTokenVault:
+    """Token vault service double recording the order of calls."""
+
+    def __init__(self, stored: bool = True):
+        self.calls: list[tuple[str, UUID]] = []
+        self.token_id = str(uuid4())
+        self.stored = stored
+
+    async def lock_user_refresh_token(self, user_id: UUID) -> None:
+        self.calls.append(("lock", user_id))
+
+    async def get_by_user_id(self, user_id: UUID, token_type=None):
+        self.calls.append(("get", user_id))
+        if not self.stored:
+            return None
+        return SimpleNamespace(id=UUID(self.token_id)), "old-refresh-token"
+
+    async def upsert_refresh_token(self, user_id: UUID, **kwargs) -> str:
+        self.calls.append(("upsert", user_id))
+        return self.token_id
+
+
+class FakeKeycloak:
+    async def refresh_access_token(self, refresh_token: str):
+        return SimpleNamespace(refresh_token="new-refresh-token", session_state="session-2")
+
+
+class FakeSession:
+    """AsyncSession double capturing executed statements."""
+
+    def __init__(self):
+        self.executed = []
+
+    async def execute(self, statement, params=None):
+        self.executed.append((statement, params))
+
+
+async def test_rotation_takes_lock_before_reading_refresh_token():
+    vault = FakeTokenVault()
+
+    token_id = await _rotate_refresh_token(
+        str(USER_ID), USER_ID, "session-1", FakeKeycloak(), vault
+    )
+
+    assert token_id == vault.token_id
+    assert vault.calls == [("lock", USER_ID), ("get", USER_ID), ("upsert", USER_ID)]
+
+
+async def test_rotation_without_stored_token_still_locks_first():
+    vault = FakeTokenVault(stored=False)
+
+    with pytest.raises(InvalidRequestError):
+        await _rotate_refresh_token(str(USER_ID), USER_ID, None, FakeKeycloak(), vault)
+
+    assert vault.calls == [("lock", USER_ID), ("get", USER_ID)]
+
+
+async def test_repository_lock_uses_transaction_scoped_advisory_lock():
+    session = FakeSession()
+
+    await TokenVaultRepository(session).lock_user_refresh_token(USER_ID)
+
+    [(statement, params)] = session.executed
+    sql = str(statement.compile(dialect=postgresql.dialect()))
+    assert "pg_advisory_xact_lock" in sql
+    assert params == {"lock_key": repository_module._advisory_lock_key(USER_ID)}
+
+
+def test_advisory_lock_key_is_stable_signed_bigint():
+    key = repository_module._advisory_lock_key(USER_ID)
+    other_user = UUID(int=USER_ID.int ^ (1 << 100))
+
+    assert key == repository_module._advisory_lock_key(USER_ID)
+    assert -(2**63) <= key < 2**63
+    assert key != repository_module._advisory_lock_key(other_user)
@@ -0,0 +1,139 @@
+"""Tests for state token generation and parsing."""
+
+import base64
+import hashlib
+import hmac
+import time
+from uuid import UUID
+
+import jwt
+import pytest
+
+from app.core.exceptions import InvalidStateTokenError
+from app.services.state_token import StateTokenService
+
+SECRET = "state-token-secret-of-at-least-32-bytes"
+USER_ID = "3f6c1a52-8d4e-4b7a-9c2f-1e5d7a9b0c3d"
+
+
+@pytest.fixture
+def service() -> StateTokenService:
+    return StateTokenService(SECRET)
+
+
+def _b64url(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def _signed(header: str, claims: str) -> str:
+    """Assemble a token over arbitrary segments with a valid signature."""
+    signature = hmac.new(SECRET.encode(), f"{header}.{claims}".encode(), hashlib.sha256).digest()
+    return f"{header}.{claims}.{_b64url(signature)}"
+
+
+def test_round_trip(service):
+    token = service.generate_state_token(USER_ID, "session-1")
+
+    payload = service.parse_state_token(token)
+
+    assert payload.user_id == UUID(USER_ID)
+    assert payload.session_state_id == "session-1"
+
+
+def test_generated_token_decodes_with_pyjwt(service):
+    token = service.generate_state_token(USER_ID, "session-1", expires_in=60)
+
+    header = jwt.get_unverified_header(token)
+    claims = jwt.decode(token, SECRET, algorithms=["HS256"])
+
+    assert header == {"alg": "HS256", "typ": "JWT"}
+    assert claims["user_id"] == USER_ID
+    assert claims["session_state_id"] == "session-1"
+    assert claims["exp"] - claims["iat"] == 60
+
+
+def test_pyjwt_token_parses(service):
+    token = jwt.encode(
+        {"user_id": USER_ID, "session_state_id": "session-1", "exp": int(time.time()) + 60},
+        SECRET,
+        algorithm="HS256",
+    )
+
+    assert service.parse_state_token(token).session_state_id == "session-1"
+
+
+def test_rejects_tampered_signature(service):
+    header, claims, signature = service.generate_state_token(USER_ID, "session-1").split(".")
+    flipped = ("A" if signature[0] != "A" else "B") + signature[1:]
+
+    with pytest.raises(InvalidStateTokenError, match="Signature verification failed"):
+        service.parse_state_token(f"{header}.{claims}.{flipped}")
+
+
+def test_rejects_tampered_payload(service):
+    header, _, signature = service.generate_state_token(USER_ID, "session-1").split(".")
+    forged = _b64url(
+        b'{"user_id":"%s","session_state_id":"other","exp":%d}'
+        % (USER_ID.encode(), int(time.time()) + 60)
+    )
+
+    with pytest.raises(InvalidStateTokenError, match="Signature verification failed"):
+        service.parse_state_token(f"{header}.{forged}.{signature}")
+
+
+def test_rejects_token_signed_with_other_secret(service):
+    token = StateTokenService("other-secret").generate_state_token(USER_ID, "session-1")
+
+    with pytest.raises(InvalidStateTokenError):
+        service.parse_state_token(token)
+
+
+def test_rejects_expired_token(service):
+    token = service.generate_state_token(USER_ID, "session-1", expires_in=-1)
+
+    with pytest.raises(InvalidStateTokenError, match="expired"):
+        service.parse_state_token(token)
+
+
+def test_rejects_alg_none(service):
+    claims = _b64url(
+        b'{"user_id":"%s","session_state_id":"session-1","exp":%d}'
+        % (USER_ID.encode(), int(time.time()) + 60)
+    )
+    header = _b64url(b'{"alg":"none","typ":"JWT"}')
+
+    for token in (f"{header}.{claims}.", f"{header}.{claims}"):
+        with pytest.raises(InvalidStateTokenError):
+            service.parse_state_token(token)
+
+
+@pytest.mark.parametrize("token", ["", "abc", "a.b", "a.b.c.d", "a.b.c.d.e"])
+def test_rejects_malformed_segment_count(service, token):
+    with pytest.raises(InvalidStateTokenError):
+        service.parse_state_token(token)
+
+
+def test_rejects_bad_base64_payload(service):
+    header = service.generate_state_token(USER_ID, "session-1").split(".")[0]
+
+    for claims in ("not*base64", "a", "%%%"):
+        with pytest.raises(InvalidStateTokenError):
+            service.parse_state_token(_signed(header, claims))
+
+
+@pytest.mark.parametrize(
+    "claims",
+    [
+        b"[]",
+        b"not json",
+        b'{"user_id":"x","session_state_id":"s"}',
+        b'{"user_id":"x","session_state_id":"s","exp":"9999999999"}',
+        b'{"session_state_id":"s","exp":9999999999}',
+        b'{"user_id":"not-a-uuid","session_state_id":"s","exp":9999999999}',
+    ],
+)
+def test_rejects_signed_but_invalid_claims(service, claims):
+    header = service.generate_state_token(USER_ID, "session-1").split(".")[0]
+
+    with pytest.raises(InvalidStateTokenError):
+        service.parse_state_token(_signed(header, _b64url(claims)))
@@ -0,0 +1,152 @@
+"""Tests for the decrypted token cache in TokenVaultService."""
+
+import asyncio
+from uuid import UUID, uuid4
+
+import pytest
+
+from app.core.exceptions import TokenNotFoundError
+from app.db.models import TokenType
+from app.models.domain import TokenVaultCore
+from app.services import token_vault
+from app.services.encryption import EncryptionService
+from app.services.token_vault import TokenVaultService
+
+USER_ID = UUID("5d2b4c38-0f4e-4d8a-9a35-6b1f2f0c7e11")
+
+
+class FakeRepository:
+    """In-memory repository double for the lookups and writes the service uses."""
+
+    def __init__(self):
+        self.rows: dict[UUID, TokenVaultCore] = {}
+        self.reads = 0
+        self.commit_callbacks = []
+        self.release = asyncio.Event()
+        self.release.set()
+
+    def add(self, encryption: EncryptionService, token: str, token_type: TokenType) -> UUID:
+        encrypted_token, iv, _ = encryption.seal(token)
+        token_id = uuid4()
+        self.rows[token_id] = TokenVaultCore(token_id, token_type, "session", encrypted_token, iv)
+        return token_id
+
+    async def get_core_by_id(self, token_id: UUID):
+        self.reads += 1
+        row = self.rows.get(token_id)
+        await self.release.wait()
+        return row
+
+    async def delete_by_id(self, token_id: UUID) -> bool:
+        return self.rows.pop(token_id, None) is not None
+
+    async def upsert_refresh_token(self, user_id, encrypted_token, iv, **kwargs) -> str:
+        token_id = next(
+            (row.id for row in self.rows.values() if row.token_type == TokenType.REFRESH),
+            uuid4(),
+        )
+        self.rows[token_id] = TokenVaultCore(
+            token_id, TokenType.REFRESH, "session", encrypted_token, iv
+        )
+        return str(token_id)
+
+    def on_commit(self, callback) -> None:
+        self.commit_callbacks.append(callback)
+
+    def commit(self) -> None:
+        callbacks, self.commit_callbacks = self.commit_callbacks, []
+        for callback in callbacks:
+            callback()
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    token_vault._decrypted_token_cache.clear()
+    yield
+    token_vault._decrypted_token_cache.clear()
+
+
+@pytest.fixture
+def encryption() -> EncryptionService:
+    return EncryptionService("00" * 32)
+
+
+@pytest.fixture
+def repository() -> FakeRepository:
+    return FakeRepository()
+
+
+@pytest.fixture
+def service(repository, encryption) -> TokenVaultService:
+    return TokenVaultService(repository, encryption)
+
+
+async def test_offline_token_is_served_from_cache(service, repository, encryption):
+    token_id = repository.add(encryption, "offline-token", TokenType.OFFLINE)
+
+    first = await service.retrieve_and_decrypt(token_id)
+    second = await service.retrieve_and_decrypt(token_id)
+
+    assert first[1] == second[1] == "offline-token"
+    assert repository.reads == 1
+
+
+async def test_refresh_token_is_never_cached(service, repository, encryption):
+    token_id = repository.add(encryption, "refresh-token", TokenType.REFRESH)
+
+    await service.retrieve_and_decrypt(token_id)
+    await service.retrieve_and_decrypt(token_id)
+
+    assert repository.reads == 2
+    assert token_vault._decrypted_token_cache.get(token_id) is None
+
+
+async def test_upsert_is_seen_by_next_read(service, repository, encryption):
+    token_id = UUID(await service.upsert_refresh_token(USER_ID, "refresh-1", "session"))
+    assert (await service.retrieve_and_decrypt(token_id))[1] == "refresh-1"
+
+    replaced_id = await service.upsert_refresh_token(USER_ID, "refresh-2", "session")
+
+    assert UUID(replaced_id) == token_id
+    assert (await service.retrieve_and_decrypt(token_id))[1] == "refresh-2"
+
+
+async def test_delete_evicts_cached_token(service, repository, encryption):
+    token_id = repository.add(encryption, "offline-token", TokenType.OFFLINE)
+    await service.retrieve_and_decrypt(token_id)
+
+    assert await service.delete_token(token_id)
+    repository.commit()
+
+    with pytest.raises(TokenNotFoundError):
+        await service.retrieve_and_decrypt(token_id)
+    assert repository.reads == 2
+
+
+async def test_read_before_delete_commits_is_evicted_on_commit(service, repository, encryption):
+    token_id = repository.add(encryption, "offline-token", TokenType.OFFLINE)
+    row = repository.rows[token_id]
+
+    await service.delete_token(token_id)
+    # Until the DELETE commits, other sessions still see the row
+    repository.rows[token_id] = row
+    await service.retrieve_and_decrypt(token_id)
+    assert token_vault._decrypted_token_cache.get(token_id) is not None
+
+    del repository.rows[token_id]
+    repository.commit()
+
+    assert token_vault._decrypted_token_cache.get(token_id) is None
+
+
+async def test_in_flight_read_does_not_cache_deleted_token(service, repository, encryption):
+    token_id = repository.add(encryption, "offline-token", TokenType.OFFLINE)
+    repository.release.clear()
+    read = asyncio.create_task(service.retrieve_and_decrypt(token_id))
+    await asyncio.sleep(0)
+
+    await service.delete_token(token_id)
+    repository.release.set()
+
+    assert (await read)[1] == "offline-token"
+    assert token_vault._decrypted_token_cache.get(token_id) is None
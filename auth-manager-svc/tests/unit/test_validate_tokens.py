@@ -0,0 +1,113 @@
+"""Tests for the batch token validation endpoint."""
+
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.v1.auth_manager.validate_token import validate_tokens
+from app.core.exceptions import KeycloakError
+from app.dependencies import get_keycloak_service
+from app.main import app
+from app.models.domain import TokenIntrospection
+from app.models.requests import MAX_VALIDATE_TOKENS, ValidateTokensRequest
+
+URL = "/api/auth/manager/validate-tokens"
+AUTH = {"Authorization": "Bearer caller-token"}
+
+
+class FakeKeycloak:
+    """Keycloak service double answering introspection from a fixed table."""
+
+    def __init__(self, results: dict):
+        self.results = {"caller-token": True, **results}
+        self.introspected: list[str] = []
+
+    async def introspect_token(self, token: str) -> TokenIntrospection:
+        self.introspected.append(token)
+        result = self.results.get(token, False)
+        if isinstance(result, BaseException):
+            raise result
+        return TokenIntrospection(active=result)
+
+
+@pytest.fixture
+def fake_keycloak() -> FakeKeycloak:
+    return FakeKeycloak({})
+
+
+@pytest.fixture
+def client(fake_keycloak):
+    app.dependency_overrides[get_keycloak_service] = lambda: fake_keycloak
+    yield TestClient(app)
+    app.dependency_overrides.pop(get_keycloak_service, None)
+
+
+def test_results_keep_submission_order(client, fake_keycloak):
+    fake_keycloak.results.update({"a": True, "b": False, "c": True, "d": False})
+
+    response = client.post(URL, json={"tokens": ["d", "a", "c", "b", "a"]}, headers=AUTH)
+
+    assert response.status_code == 200
+    assert [item["valid"] for item in response.json()["data"]] == [
+        False,
+        True,
+        True,
+        False,
+        True,
+    ]
+
+
+def test_failed_introspection_marks_only_its_token_invalid(client, fake_keycloak):
+    fake_keycloak.results.update(
+        {"ok": True, "broken": KeycloakError("unavailable", status_code=503)}
+    )
+
+    response = client.post(URL, json={"tokens": ["ok", "broken", "ok"]}, headers=AUTH)
+
+    assert response.status_code == 200
+    assert [item["valid"] for item in response.json()["data"]] == [True, False, True]
+
+
+def test_inactive_caller_is_rejected(client, fake_keycloak):
+    fake_keycloak.results["caller-token"] = False
+
+    response = client.post(URL, json={"tokens": ["a"]}, headers=AUTH)
+
+    assert response.status_code == 401
+    assert response.json()["code"] == "token_not_active"
+    assert fake_keycloak.introspected == ["caller-token"]
+
+
+def test_missing_bearer_token_is_rejected(client):
+    response = client.post(URL, json={"tokens": ["a"]})
+
+    assert response.status_code == 401
+
+
+def test_batch_limit(client, fake_keycloak):
+    # Request validation errors are reported as 400 validation_error app-wide
+    at_limit = client.post(URL, json={"tokens": ["a"] * MAX_VALIDATE_TOKENS}, headers=AUTH)
+    over_limit = client.post(URL, json={"tokens": ["a"] * (MAX_VALIDATE_TOKENS + 1)}, headers=AUTH)
+
+    assert at_limit.status_code == 200
+    assert len(at_limit.json()["data"]) == MAX_VALIDATE_TOKENS
+    assert over_limit.status_code == 400
+    assert over_limit.json()["code"] == "validation_error"
+    assert len(fake_keycloak.introspected) == 1 + MAX_VALIDATE_TOKENS
+
+
+def test_empty_batch_is_rejected(client):
+    response = client.post(URL, json={"tokens": []}, headers=AUTH)
+
+    assert response.status_code == 400
+    assert response.json()["code"] == "validation_error"
+
+
+async def test_cancellation_propagates():
+    keycloak = FakeKeycloak({"ok": True, "cancelled": asyncio.CancelledError()})
+
+    with pytest.raises(asyncio.CancelledError):
+        await validate_tokens(
+            ValidateTokensRequest(tokens=["ok", "cancelled"]), "caller-token", keycloak
+        )
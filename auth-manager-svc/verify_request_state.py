@@ -1,145 +1,129 @@
-"""Verification script for request state pattern."""
+"""Verification script for the database session dependency pattern.
 
+The checks are static: the modules are parsed with ``ast`` instead of being
+imported, so the script runs without the application's dependencies or
+environment.
+"""
+
+import ast
 import sys
+from functools import lru_cache
 from pathlib import Path
 
-sys.path.insert(0, str(Path(__file__).parent))
+ROOT = Path(__file__).parent
 
 
-def verify_request_state_pattern():
-    """Verify that the request state pattern is properly implemented."""
-    print("=" * 80)
-    print("VERIFICATION: Request State Pattern")
-    print("=" * 80)
-    print()
+@lru_cache(maxsize=None)
+def _load_ast(path: str) -> ast.Module:
+    """Parse a module under the service root once."""
+    return ast.parse((ROOT / path).read_text(), filename=path)
 
-    try:
-        # Import the FastAPI app
-        from app.main import app
-
-        print("✓ Successfully imported FastAPI application")
-
-        # Check that middleware is registered
-        middleware_found = False
-        for middleware in app.user_middleware:
-            if hasattr(middleware, "kwargs") and "dispatch" in middleware.kwargs:
-                # Check if it's our attach_db_manager middleware
-                dispatch_func = middleware.kwargs["dispatch"]
-                if (
-                    hasattr(dispatch_func, "__name__")
-                    and "attach_db_manager" in dispatch_func.__name__
-                ):
-                    middleware_found = True
-                    break
-
-        if middleware_found:
-            print("✓ Database manager middleware is registered")
-        else:
-            print("⚠ Database manager middleware registration not explicitly verified")
-            print("  (This is normal - middleware may be registered differently)")
 
-        # Verify dependencies module
-        from app.dependencies import SessionDep, get_db
+def _find_function(tree: ast.AST, name: str) -> ast.FunctionDef | ast.AsyncFunctionDef | None:
+    """Return the first function definition called ``name`` in ``tree``."""
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) and node.name == name:
+            return node
+    return None
 
-        print("✓ get_db function imported successfully")
-        print("✓ SessionDep type alias imported successfully")
 
-        # Check get_db signature
-        import inspect
+def _is_async_generator(node: ast.AST | None) -> bool:
+    """Whether ``node`` is an ``async def`` containing a ``yield``."""
+    return isinstance(node, ast.AsyncFunctionDef) and any(
+        isinstance(child, (ast.Yield, ast.YieldFrom)) for child in ast.walk(node)
+    )
 
-        sig = inspect.signature(get_db)
-        params = list(sig.parameters.keys())
 
-        if "request" in params:
-            print("✓ get_db accepts 'request' parameter")
-        else:
-            print("✗ get_db does not accept 'request' parameter")
-            return False
+def _find_assignment(tree: ast.Module, name: str) -> ast.expr | None:
+    """Return the value assigned to module-level ``name``."""
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and any(
+            isinstance(target, ast.Name) and target.id == name for target in node.targets
+        ):
+            return node.value
+    return None
 
-        # Verify the function is async generator
-        if inspect.isasyncgenfunction(get_db):
-            print("✓ get_db is an async generator function")
-        else:
-            print("✗ get_db is not an async generator function")
-            return False
 
-        # Check that SessionDep uses get_db
-        from typing import get_args, get_origin
+def _is_annotated_depends(value: ast.expr | None, dependency: str) -> bool:
+    """Whether ``value`` is ``Annotated[..., Depends(dependency)]``."""
+    if not (
+        isinstance(value, ast.Subscript)
+        and isinstance(value.value, ast.Name)
+        and value.value.id == "Annotated"
+    ):
+        return False
+    return any(
+        isinstance(node, ast.Call)
+        and isinstance(node.func, ast.Name)
+        and node.func.id == "Depends"
+        and any(isinstance(arg, ast.Name) and arg.id == dependency for arg in node.args)
+        for node in ast.walk(value.slice)
+    )
+
 
-        from fastapi import Depends
+def verify_request_state_pattern():
+    """Verify that database sessions are provided through FastAPI dependencies."""
+    print("=" * 80)
+    print("VERIFICATION: Database Session Dependencies")
+    print("=" * 80)
+    print()
 
-        # SessionDep should be Annotated[AsyncSession, Depends(get_db)]
-        if hasattr(SessionDep, "__metadata__"):
-            metadata = SessionDep.__metadata__
-            depends_found = False
-            for item in metadata:
-                if isinstance(item, Depends):
-                    if item.dependency == get_db:
-                        depends_found = True
-                        break
+    try:
+        dependencies = _load_ast("app/dependencies.py")
+        print("✓ Parsed app/dependencies.py")
 
-            if depends_found:
-                print("✓ SessionDep uses Depends(get_db)")
+        for name in ("get_db", "get_read_db"):
+            if _is_async_generator(_find_function(dependencies, name)):
+                print(f"✓ {name} is an async generator function")
             else:
-                print("✗ SessionDep does not use Depends(get_db)")
+                print(f"✗ {name} is not an async generator function")
                 return False
-        else:
-            print("⚠ Could not verify SessionDep metadata")
 
-        # Verify database manager is accessible
-        from app.db.base import db_manager
+        for alias, dependency in (("SessionDep", "get_db"), ("ReadSessionDep", "get_read_db")):
+            if _is_annotated_depends(_find_assignment(dependencies, alias), dependency):
+                print(f"✓ {alias} uses Depends({dependency})")
+            else:
+                print(f"✗ {alias} does not use Depends({dependency})")
+                return False
 
-        print("✓ db_manager is importable")
+        # Verify the database manager provides both kinds of session
+        base = _load_ast("app/db/base.py")
+        for method in ("session", "read_session"):
+            if _is_async_generator(_find_function(base, method)):
+                print(f"✓ DatabaseSessionManager.{method}() yields sessions")
+            else:
+                print(f"✗ DatabaseSessionManager.{method}() is missing or does not yield")
+                return False
 
-        if hasattr(db_manager, "session"):
-            print("✓ db_manager has session() method")
+        if _find_assignment(base, "db_manager") is not None:
+            print("✓ db_manager is defined in app.db.base")
         else:
-            print("✗ db_manager does not have session() method")
+            print("✗ db_manager is not defined in app.db.base")
             return False
 
-        # Verify endpoints use SessionDep
-        from app.api import health
-        from app.api.v1.auth_manager import validate_token
-
-        print("✓ Health endpoint module imported")
-        print("✓ Validate token endpoint module imported")
-
-        # Check health endpoint signature
-        sig = inspect.signature(health.readiness_check)
-        params = sig.parameters
-
-        session_dep_used = False
-        for param_name, param in params.items():
-            if param_name == "db":
-                # Check if it uses SessionDep
-                annotation = param.annotation
-                if annotation == SessionDep or "SessionDep" in str(annotation):
-                    session_dep_used = True
-                    break
-
-        if session_dep_used:
-            print("✓ Health endpoint uses SessionDep")
+        # Check the readiness endpoint takes its session from a dependency
+        readiness = _find_function(_load_ast("app/api/health.py"), "readiness_check")
+        annotations = [
+            ast.unparse(arg.annotation)
+            for arg in (readiness.args.args if readiness else [])
+            if arg.arg == "db" and arg.annotation is not None
+        ]
+        if annotations and annotations[0] in ("SessionDep", "ReadSessionDep"):
+            print(f"✓ Health endpoint uses {annotations[0]}")
         else:
-            print("⚠ Health endpoint may not use SessionDep (check manually)")
+            print("⚠ Health endpoint may not use a session dependency (check manually)")
 
         print()
         print("=" * 80)
-        print("✓ REQUEST STATE PATTERN VERIFICATION PASSED")
+        print("✓ DATABASE SESSION DEPENDENCY VERIFICATION PASSED")
         print("=" * 80)
         print()
         print("Implementation Summary:")
-        print("- Database manager stored in request.state")
-        print(
-            "- get_db(request: Request) yields session from request.state.database_session_manager"
-        )
+        print("- get_db() yields a transactional session from db_manager.session()")
+        print("- get_read_db() yields an autocommit session from db_manager.read_session()")
         print("- SessionDep = Annotated[AsyncSession, Depends(get_db)]")
-        print("- Endpoints use SessionDep for database access")
-        print()
-        print("Pattern Benefits:")
-        print("- Cleaner dependency injection")
-        print("- Request-scoped database sessions")
-        print("- Better testability")
-        print("- Explicit request context")
+        print("- ReadSessionDep = Annotated[AsyncSession, Depends(get_read_db)]")
+        print("- Endpoints use SessionDep / ReadSessionDep for database access")
         print()
 
         return True
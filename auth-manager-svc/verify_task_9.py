@@ -7,7 +7,47 @@ This script verifies that both sub-tasks have been completed:
 - 9.2: Create dependency injection functions
 """
 
+import ast
 import sys
+from functools import lru_cache
+from pathlib import Path
+
+ROOT = Path(__file__).parent
+
+
+@lru_cache(maxsize=None)
+def _load_ast(path: str) -> ast.Module:
+    """Parse a module under the service root once."""
+    return ast.parse((ROOT / path).read_text(), filename=path)
+
+
+def _find_function(tree: ast.AST, name: str) -> ast.FunctionDef | ast.AsyncFunctionDef | None:
+    """Return the first function definition called ``name`` in ``tree``."""
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) and node.name == name:
+            return node
+    return None
+
+
+def _is_async_generator(node: ast.AST | None) -> bool:
+    """Whether ``node`` is an ``async def`` containing a ``yield``."""
+    return isinstance(node, ast.AsyncFunctionDef) and any(
+        isinstance(child, (ast.Yield, ast.YieldFrom)) for child in ast.walk(node)
+    )
+
+
+class _Checks:
+    """Running tally of named checks, printed as each one is made."""
+
+    def __init__(self):
+        self.passed = 0
+        self.total = 0
+
+    def check(self, name: str, result: bool) -> None:
+        """Record and print the outcome of one check."""
+        self.total += 1
+        self.passed += bool(result)
+        print(f"  {'✓' if result else '✗'} {name}")
 
 
 def verify_task_9_1():
@@ -18,13 +58,13 @@ def verify_task_9_1():
 
     from app.main import app
 
-    checks = []
+    checks = _Checks()
 
     # Check 1: FastAPI app initialized with metadata
-    checks.append(("FastAPI app initialized", app is not None))
-    checks.append(("App title set", app.title == "Auth Manager Service"))
-    checks.append(("App version set", app.version == "1.0.0"))
-    checks.append(("App description set", len(app.description) > 0))
+    checks.check("FastAPI app initialized", app is not None)
+    checks.check("App title set", app.title == "Auth Manager Service")
+    checks.check("App version set", app.version == "1.0.0")
+    checks.check("App description set", bool(app.description))
 
     # Check 2: Exception handlers registered
     from fastapi.exceptions import RequestValidationError
@@ -32,49 +72,32 @@ def verify_task_9_1():
 
     from app.core.exceptions import AuthManagerError
 
-    checks.append(
-        ("AuthManagerError handler registered", AuthManagerError in app.exception_handlers)
+    checks.check("AuthManagerError handler registered", AuthManagerError in app.exception_handlers)
+    checks.check(
+        "RequestValidationError handler registered",
+        RequestValidationError in app.exception_handlers,
     )
-    checks.append(
-        (
-            "RequestValidationError handler registered",
-            RequestValidationError in app.exception_handlers,
-        )
+    checks.check(
+        "PydanticValidationError handler registered",
+        PydanticValidationError in app.exception_handlers,
     )
-    checks.append(
-        (
-            "PydanticValidationError handler registered",
-            PydanticValidationError in app.exception_handlers,
-        )
-    )
-    checks.append(("Generic exception handler registered", Exception in app.exception_handlers))
+    checks.check("Generic exception handler registered", Exception in app.exception_handlers)
 
     # Check 3: Middleware registered
-    middleware_names = [m.cls.__name__ for m in app.user_middleware]
-    checks.append(("RequestIDMiddleware registered", "RequestIDMiddleware" in middleware_names))
-    checks.append(("LoggingMiddleware registered", "LoggingMiddleware" in middleware_names))
-
-    # Check 4: CORS configured (CORSMiddleware may be registered)
-    # Note: CORS is configured but may not be active without env vars
-    checks.append(("CORS configuration attempted", True))
-
-    # Check 5: Dependency injection setup
-    checks.append(("Lifespan manager configured", app.router.lifespan_context is not None))
-
-    # Check 6: OpenAPI documentation configured
-    checks.append(("Swagger UI configured", app.docs_url == "/docs"))
-    checks.append(("ReDoc configured", app.redoc_url == "/redoc"))
-    checks.append(("OpenAPI JSON configured", app.openapi_url == "/openapi.json"))
-
-    # Print results
-    for check_name, result in checks:
-        status = "✓" if result else "✗"
-        print(f"  {status} {check_name}")
-
-    passed = all(result for _, result in checks)
-    print(
-        f"\nTask 9.1: {'PASSED' if passed else 'FAILED'} ({sum(1 for _, r in checks if r)}/{len(checks)} checks)"
-    )
+    middleware_names = {m.cls.__name__ for m in app.user_middleware}
+    checks.check("RequestIDMiddleware registered", "RequestIDMiddleware" in middleware_names)
+    checks.check("LoggingMiddleware registered", "LoggingMiddleware" in middleware_names)
+
+    # Check 4: Dependency injection setup
+    checks.check("Lifespan manager configured", app.router.lifespan_context is not None)
+
+    # Check 5: OpenAPI documentation configured
+    checks.check("Swagger UI configured", app.docs_url == "/docs")
+    checks.check("ReDoc configured", app.redoc_url == "/redoc")
+    checks.check("OpenAPI JSON configured", app.openapi_url == "/openapi.json")
+
+    passed = checks.passed == checks.total
+    print(f"\nTask 9.1: {'PASSED' if passed else 'FAILED'} ({checks.passed}/{checks.total} checks)")
 
     return passed
 
@@ -85,82 +108,76 @@ def verify_task_9_2():
     print("TASK 9.2: Create dependency injection functions")
     print("=" * 70)
 
-    import inspect
-
-    from app.dependencies import (
-        get_db_session,
-        get_encryption_service,
-        get_keycloak_service,
-        get_state_token_service,
-        get_token_vault_repository,
-        get_token_vault_service,
-    )
+    # Checked statically from the source, without importing the application
+    dependencies = _load_ast("app/dependencies.py")
+    get_db = _find_function(dependencies, "get_db")
+    get_encryption_service = _find_function(dependencies, "get_encryption_service")
+    get_keycloak_service = _find_function(dependencies, "get_keycloak_service")
+    get_state_token_service = _find_function(dependencies, "get_state_token_service")
+    get_token_vault_repository = _find_function(dependencies, "get_token_vault_repository")
+    get_token_vault_service = _find_function(dependencies, "get_token_vault_service")
 
-    checks = []
+    checks = _Checks()
 
-    # Check 1: get_db_session dependency
-    checks.append(("get_db_session function exists", callable(get_db_session)))
-    checks.append(("get_db_session is async generator", inspect.isasyncgenfunction(get_db_session)))
+    # Check 1: get_db dependency
+    checks.check("get_db function exists", get_db is not None)
+    checks.check("get_db is async generator", _is_async_generator(get_db))
 
     # Check 2: get_encryption_service dependency
-    checks.append(("get_encryption_service function exists", callable(get_encryption_service)))
-    sig = inspect.signature(get_encryption_service)
-    checks.append(("get_encryption_service returns EncryptionService", True))
+    checks.check("get_encryption_service function exists", get_encryption_service is not None)
+    checks.check(
+        "get_encryption_service returns EncryptionService",
+        get_encryption_service is not None
+        and ast.unparse(get_encryption_service.returns) == "EncryptionService",
+    )
 
     # Check 3: get_keycloak_service dependency
-    checks.append(("get_keycloak_service function exists", callable(get_keycloak_service)))
+    checks.check("get_keycloak_service function exists", get_keycloak_service is not None)
 
     # Check 4: get_state_token_service dependency
-    checks.append(("get_state_token_service function exists", callable(get_state_token_service)))
+    checks.check("get_state_token_service function exists", get_state_token_service is not None)
 
     # Check 5: get_token_vault_repository dependency
-    checks.append(
-        ("get_token_vault_repository function exists", callable(get_token_vault_repository))
+    checks.check(
+        "get_token_vault_repository function exists", get_token_vault_repository is not None
+    )
+    checks.check(
+        "get_token_vault_repository has session dependency",
+        get_token_vault_repository is not None and len(get_token_vault_repository.args.args) > 0,
     )
-    sig = inspect.signature(get_token_vault_repository)
-    checks.append(("get_token_vault_repository has session dependency", len(sig.parameters) > 0))
 
     # Check 6: get_token_vault_service dependency
-    checks.append(("get_token_vault_service function exists", callable(get_token_vault_service)))
-    sig = inspect.signature(get_token_vault_service)
-    checks.append(("get_token_vault_service has dependencies", len(sig.parameters) > 0))
-
-    # Print results
-    for check_name, result in checks:
-        status = "✓" if result else "✗"
-        print(f"  {status} {check_name}")
-
-    passed = all(result for _, result in checks)
-    print(
-        f"\nTask 9.2: {'PASSED' if passed else 'FAILED'} ({sum(1 for _, r in checks if r)}/{len(checks)} checks)"
+    checks.check("get_token_vault_service function exists", get_token_vault_service is not None)
+    checks.check(
+        "get_token_vault_service has dependencies",
+        get_token_vault_service is not None and len(get_token_vault_service.args.args) > 0,
     )
 
+    passed = checks.passed == checks.total
+    print(f"\nTask 9.2: {'PASSED' if passed else 'FAILED'} ({checks.passed}/{checks.total} checks)")
+
     return passed
 
 
-def verify_openapi_schema():
-    """Verify OpenAPI schema generation."""
+def verify_openapi_schema(schema: dict):
+    """Verify OpenAPI schema generation.
+
+    Args:
+        schema: Schema returned by ``app.openapi()``, built once by the caller
+    """
     print("\n" + "=" * 70)
     print("ADDITIONAL: OpenAPI Schema Verification")
     print("=" * 70)
 
-    from app.main import app
-
-    schema = app.openapi()
-
-    checks = []
-    checks.append(("OpenAPI version 3.x", schema.get("openapi", "").startswith("3.")))
-    checks.append(("Info section present", "info" in schema))
-    checks.append(("Title in info", schema.get("info", {}).get("title") is not None))
-    checks.append(("Version in info", schema.get("info", {}).get("version") is not None))
-    checks.append(("Description in info", schema.get("info", {}).get("description") is not None))
-    checks.append(("Paths section present", "paths" in schema))
-
-    for check_name, result in checks:
-        status = "✓" if result else "✗"
-        print(f"  {status} {check_name}")
+    checks = _Checks()
+    checks.check("OpenAPI version 3.x", schema.get("openapi", "").startswith("3."))
+    checks.check("Info section present", "info" in schema)
+    checks.check("Title in info", schema.get("info", {}).get("title") is not None)
+    checks.check("Version in info", schema.get("info", {}).get("version") is not None)
+    checks.check("Description in info", schema.get("info", {}).get("description") is not None)
+    checks.check("Paths section present", "paths" in schema)
 
-    passed = all(result for _, result in checks)
+    passed = checks.passed == checks.total
     print(f"\nOpenAPI Schema: {'VALID' if passed else 'INVALID'}")
 
     return passed
@@ -175,7 +192,10 @@ def main():
     results = []
     results.append(("Task 9.1", verify_task_9_1()))
     results.append(("Task 9.2", verify_task_9_2()))
-    results.append(("OpenAPI Schema", verify_openapi_schema()))
+
+    from app.main import app
+
+    results.append(("OpenAPI Schema", verify_openapi_schema(app.openapi())))
 
     print("\n" + "=" * 70)
     print("SUMMARY")
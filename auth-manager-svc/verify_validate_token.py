@@ -4,11 +4,63 @@ This script verifies that the validate token endpoint is properly implemented
 and registered in the FastAPI application.
 """
 
+import ast
 import sys
 from pathlib import Path
 
-# Add the app directory to the Python path
-sys.path.insert(0, str(Path(__file__).parent))
+ROOT = Path(__file__).parent
+
+# Sources read by the static checks, which run before the app is imported
+SOURCE_FILES = (
+    "app/api/v1/auth_manager/validate_token.py",
+    "app/api/v1/auth_manager/__init__.py",
+    "app/main.py",
+)
+
+
+def _check_files_exist() -> bool:
+    """Report any missing source files, so the script fails before importing the app."""
+    missing = [path for path in SOURCE_FILES if not (ROOT / path).is_file()]
+    for path in missing:
+        print(f"✗ Missing source file: {path}")
+    return not missing
+
+
+def _parse(path: str) -> ast.Module:
+    """Parse a module under the service root."""
+    return ast.parse((ROOT / path).read_text(), filename=path)
+
+
+def _router_calls(tree: ast.Module, owner: str, method: str) -> list[ast.Call]:
+    """Return calls of ``owner.method(...)`` anywhere in ``tree``."""
+    return [
+        node
+        for node in ast.walk(tree)
+        if isinstance(node, ast.Call)
+        and isinstance(node.func, ast.Attribute)
+        and node.func.attr == method
+        and isinstance(node.func.value, ast.Name)
+        and node.func.value.id == owner
+    ]
+
+
+def _find_route(tree: ast.Module, path: str) -> tuple[str, str] | None:
+    """Return ``(method, handler)`` for the ``@router.<method>(path)`` decorator."""
+    for node in tree.body:
+        if not isinstance(node, ast.AsyncFunctionDef | ast.FunctionDef):
+            continue
+        for decorator in node.decorator_list:
+            if (
+                isinstance(decorator, ast.Call)
+                and isinstance(decorator.func, ast.Attribute)
+                and isinstance(decorator.func.value, ast.Name)
+                and decorator.func.value.id == "router"
+                and decorator.args
+                and isinstance(decorator.args[0], ast.Constant)
+                and decorator.args[0].value == path
+            ):
+                return decorator.func.attr.upper(), node.name
+    return None
 
 
 def verify_endpoint_registration():
@@ -19,42 +71,44 @@ def verify_endpoint_registration():
     print()
 
     try:
-        # Import the FastAPI app
-        from app.main import app
-
-        print("✓ Successfully imported FastAPI application")
+        if not _check_files_exist():
+            return False
 
-        # Get all routes
-        routes = []
-        for route in app.routes:
-            if hasattr(route, "path") and hasattr(route, "methods"):
-                routes.append((route.path, route.methods, route.name))
+        # Route registration is read from the source rather than by walking app.routes
+        route = _find_route(_parse("app/api/v1/auth_manager/validate_token.py"), "/validate-token")
+        if route is None:
+            print("✗ No @router handler for /validate-token in validate_token.py")
+            return False
 
-        print(f"✓ Found {len(routes)} routes in the application")
-        print()
+        included = any(
+            ast.unparse(call.args[0]) == "validate_token.router"
+            for call in _router_calls(
+                _parse("app/api/v1/auth_manager/__init__.py"), "router", "include_router"
+            )
+            if call.args
+        )
+        if not included:
+            print("✗ validate_token.router is not included in the auth manager router")
+            return False
 
-        # Check for the validate token endpoint
-        validate_token_route = None
-        for path, methods, name in routes:
-            if "/validate-token" in path:
-                validate_token_route = (path, methods, name)
-                break
-
-        if validate_token_route:
-            path, methods, name = validate_token_route
-            print("✓ Validate token endpoint is registered:")
-            print(f"  - Path: {path}")
-            print(f"  - Methods: {methods}")
-            print(f"  - Name: {name}")
-            print()
-        else:
-            print("✗ Validate token endpoint NOT found in registered routes")
-            print()
-            print("Available routes:")
-            for path, methods, name in routes:
-                print(f"  - {path} [{', '.join(methods)}] ({name})")
+        prefixes = [
+            keyword.value.value
+            for call in _router_calls(_parse("app/main.py"), "app", "include_router")
+            if call.args and ast.unparse(call.args[0]) == "auth_manager_router"
+            for keyword in call.keywords
+            if keyword.arg == "prefix" and isinstance(keyword.value, ast.Constant)
+        ]
+        if not prefixes:
+            print("✗ Auth manager router is not included in the application")
             return False
 
+        method, name = route
+        print("✓ Validate token endpoint is registered:")
+        print(f"  - Path: {prefixes[0]}/validate-token")
+        print(f"  - Methods: {{'{method}'}}")
+        print(f"  - Name: {name}")
+        print()
+
         # Verify the endpoint module exists
         try:
             from app.api.v1.auth_manager import validate_token
@@ -92,9 +146,11 @@ def verify_endpoint_registration():
             return False
 
         # Check OpenAPI schema
-        openapi_schema = app.openapi()
-        if "/api/auth/manager/validate-token" in openapi_schema.get("paths", {}):
-            endpoint_spec = openapi_schema["paths"]["/api/auth/manager/validate-token"]
+        from app.main import app
+
+        openapi_paths = app.openapi().get("paths", {})
+        endpoint_spec = openapi_paths.get("/api/auth/manager/validate-token")
+        if endpoint_spec is not None:
             print("✓ Endpoint is documented in OpenAPI schema:")
             print(f"  - Methods: {list(endpoint_spec.keys())}")
             if "get" in endpoint_spec:
@@ -138,5 +194,9 @@ def verify_endpoint_registration():
 
 
 if __name__ == "__main__":
+    # Make the app package importable when run from another directory
+    if str(ROOT) not in sys.path:
+        sys.path.insert(0, str(ROOT))
+
     success = verify_endpoint_registration()
     sys.exit(0 if success else 1)